@@ -0,0 +1,52 @@
+import argparse
+import asyncio
+import os
+from app.config import settings
+from app.services.http_client import http_client_manager
+from app.services.itinerary import itinerary_service
+
+TOP_DESTINATIONS_FILE = os.path.join(os.path.dirname(__file__), "data", "top_destinations.txt")
+
+
+def _read_names(path: str):
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+async def warm_geonames(names):
+    """Preload the itinerary geoname cache"""
+
+    await http_client_manager.startup()
+    try:
+        results = await itinerary_service.warm(names)
+    finally:
+        await http_client_manager.shutdown()
+
+    for name, status in results.items():
+        print(f"{name}: {status}")
+
+    failed = sum(1 for status in results.values() if status != "ok")
+    print(f"Warmed {len(results) - failed}/{len(results)} places into {settings.GEONAME_CACHE_PATH}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Retell flight API maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    warm = commands.add_parser("warm-geonames", help="Preload geonames for top destinations")
+    warm.add_argument("names", nargs="*", help="Place names (defaults to the bundled top destinations)")
+    warm.add_argument("--file", help="File with one place name per line")
+
+    args = parser.parse_args()
+
+    if args.command == "warm-geonames":
+        names = list(args.names)
+        if args.file:
+            names += _read_names(args.file)
+        if not names:
+            names = _read_names(TOP_DESTINATIONS_FILE)
+        asyncio.run(warm_geonames(names))
+
+
+if __name__ == "__main__":
+    main()
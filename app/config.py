@@ -1,5 +1,5 @@
 import os
-from typing import Optional
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings
 
 
@@ -17,17 +17,139 @@ class Settings(BaseSettings):
     PORT: int = 8000
     DEBUG: bool = False
     VERIFY_RETELL_SIGNATURE: bool = True
+    RETELL_SIGNATURE_TOLERANCE_MS: int = 300000
+
+    #Retell Custom LLM Settings
+    RETELL_LLM_GREETING: str = "Hi, I can help with flights, weather, local time and currency conversion. What do you need?"
+    RETELL_LLM_SLOT_TURNS: int = 4
+
+    #Logging Settings
+    LOG_LEVEL: str = "INFO"
+    LOG_BODY_SAMPLE_RATE: float = 0.0
+    LOG_BODY_MAX_BYTES: int = 2048
+    LOG_REDACT_HEADERS: str = "authorization,proxy-authorization,cookie,set-cookie,x-api-key,x-retell-signature"
 
     #Amadeus API Settings
     AMADEUS_TOKEN_URL: str = "https://test.api.amadeus.com/v1/security/oauth2/token"
     AMADEUS_FLIGHT_URL: str = "https://test.api.amadeus.com/v2/shopping/flight-offers"
     AMADEUS_TOKEN_CACHE_TIME: int = 1800
+    AMADEUS_TOKEN_REFRESH_MARGIN: int = 120
+    AMADEUS_TOKEN_RETRY_INTERVAL: int = 10
+    AMADEUS_TOKEN_LEASE_TIME: int = 10
 
     #Flight Search Settings
     MAX_FLIGHT_RESULTS: int = 10
     VOICE_FLIGHT_RESULTS: int = 3
     DEFAULT_CURRENCY:str = "USD"
     REQUEST_TIMEOUT: int = 30
+    FLEXIBLE_SEARCH_MAX_DAYS: int = 14
+    FLIGHT_SEARCH_CONCURRENCY: int = 5
+    FLIGHT_BATCH_MAX_LEGS: int = 12
+
+    #Shared Cache Settings
+    CACHE_BACKEND: str = "memory"
+    SHARED_CACHE_PATH: str = "cache/shared.sqlite3"
+    SHARED_CACHE_LOCAL_TTL: float = 5.0
+    SHARED_CACHE_PURGE_INTERVAL: float = 60.0
+
+    #Negative Cache Settings
+    NEGATIVE_CACHE_TTL: int = 120
+    NEGATIVE_CACHE_MAX_ENTRIES: int = 1024
+    NEGATIVE_CACHE_STATUSES: List[int] = [400, 404]
+
+    #Flight Cache Settings
+    FLIGHT_CACHE_TTL: int = 300
+    FLIGHT_CACHE_MAX_ENTRIES: int = 512
+    FLIGHT_CACHE_STALE_TTL: int = 0
+
+    #Exchange Rate Settings
+    EXCHANGERATE_BASE_URL: str = "https://v6.exchangerate-api.com/v6"
+    EXCHANGE_RATE_BASE_CURRENCY: str = "USD"
+    EXCHANGE_RATE_CACHE_TTL: int = 3600
+    EXCHANGE_RATE_TABLE_CACHE_SIZE: int = 32
+
+    #Weather Settings
+    OPENWEATHER_BASE_URL: str = "https://api.openweathermap.org/data/2.5/weather"
+    WEATHER_CACHE_TTL: int = 600
+    WEATHER_PLACE_CACHE_TTL: int = 86400
+    WEATHER_CACHE_MAX_ENTRIES: int = 512
+    WEATHER_BATCH_MAX_LOCATIONS: int = 10
+
+    #Itinerary Settings
+    OPENTRIPMAP_BASE_URL: str = "https://api.opentripmap.com/0.1/en/places/geoname"
+    GEONAME_CACHE_PATH: str = "cache/geonames.sqlite3"
+    GEONAME_CACHE_TTL: int = 2592000
+    GEONAME_NEGATIVE_TTL: int = 86400
+    GEONAME_MEMORY_CACHE_SIZE: int = 1024
+    GEONAME_STORE_MAX_ROWS: int = 50000
+
+    #Time Settings
+    TIMEAPI_BASE_URL: str = "https://timeapi.io/api/Time/current/zone"
+    TIME_SERVICE_MODE: str = "local"
+    TIME_REMOTE_FALLBACK: bool = False
+
+    #Deadline Settings
+    DEADLINE_HEADER: str = "X-Request-Budget-Ms"
+    DEADLINE_DEFAULT_MS: int = 30000
+    DEADLINE_MAX_MS: int = 60000
+    DEADLINE_RESERVE_MS: int = 25
+    DEADLINE_ROUTE_MS: Dict[str, int] = {
+        "/api/retell": 8000
+    }
+
+    #Trip Brief Settings
+    TRIP_BRIEF_BUDGET_MS: int = 1500
+    TRIP_BRIEF_MAX_BUDGET_MS: int = 5000
+
+    #HTTP Client Settings
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP2_ENABLED: bool = False
+
+    #Resilience Settings
+    UPSTREAM_CONNECT_TIMEOUT: float = 2.0
+    UPSTREAM_READ_TIMEOUTS: Dict[str, float] = {
+        "amadeus": 8.0,
+        "openweather": 3.0,
+        "exchangerate": 3.0,
+        "timeapi": 2.0,
+        "opentripmap": 3.0
+    }
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RESET_TIMEOUT: float = 30.0
+    UPSTREAM_MAX_RETRIES: int = 2
+    UPSTREAM_RETRY_BACKOFF: float = 0.2
+    UPSTREAM_RETRY_AFTER_MAX: float = 5.0
+    HEDGE_ENABLED: bool = False
+    HEDGE_PERCENTILE: float = 0.95
+    HEDGE_MIN_SAMPLES: int = 20
+    HEDGE_WINDOW: int = 200
+
+    #Admission Control Settings
+    ADMISSION_ENABLED: bool = True
+    UPSTREAM_MAX_CONCURRENCY: Dict[str, int] = {
+        "amadeus": 10,
+        "openweather": 20,
+        "exchangerate": 10,
+        "timeapi": 20,
+        "opentripmap": 10
+    }
+    UPSTREAM_RATE_LIMITS: Dict[str, float] = {
+        "amadeus": 10.0,
+        "openweather": 1.0,
+        "exchangerate": 1.0,
+        "timeapi": 0.0,
+        "opentripmap": 10.0
+    }
+    UPSTREAM_RATE_BURSTS: Dict[str, int] = {
+        "amadeus": 10,
+        "openweather": 60,
+        "exchangerate": 10,
+        "timeapi": 20,
+        "opentripmap": 10
+    }
+    UPSTREAM_QUEUE_SIZE: int = 50
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,111 @@
+import random
+import time
+from typing import Dict, Optional
+from app.config import settings
+from app.services.http_client import upstream_calls
+from app.utils import deadline
+from app.utils.deadline import Deadline
+from app.utils.metrics import http_request_duration, http_requests_in_flight
+import logging
+
+logger = logging.getLogger("app.requests")
+
+
+class RequestLoggingMiddleware:
+    """Pure ASGI middleware that emits one structured record per request.
+
+    Bodies are only captured for a sampled fraction of requests and are
+    capped at LOG_BODY_MAX_BYTES; sensitive headers are redacted.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.redact = {h.strip().lower() for h in settings.LOG_REDACT_HEADERS.split(",") if h.strip()}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status: Dict[str, int] = {"code": 500}
+        calls: Dict[str, int] = {}
+        token = upstream_calls.set(calls)
+        http_requests_in_flight.inc()
+
+        sampled = settings.LOG_BODY_SAMPLE_RATE > 0 and random.random() < settings.LOG_BODY_SAMPLE_RATE
+        body: Optional[bytearray] = bytearray() if sampled else None
+
+        async def receive_wrapper():
+            message = await receive()
+            if message["type"] == "http.request" and len(body) < settings.LOG_BODY_MAX_BYTES:
+                body.extend(message.get("body", b"")[:settings.LOG_BODY_MAX_BYTES - len(body)])
+            return message
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper if sampled else receive, send_wrapper)
+        finally:
+            upstream_calls.reset(token)
+            http_requests_in_flight.dec()
+
+            duration = time.perf_counter() - start
+            route = getattr(scope.get("route"), "path", None)
+            # Unmatched paths share one label so scanners can't blow up cardinality
+            http_request_duration.observe(duration, scope["method"], route or "unmatched", str(status["code"]))
+
+            fields = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": route,
+                "status": status["code"],
+                "duration_ms": round(duration * 1000, 2),
+                "upstream_calls": calls
+            }
+
+            if sampled:
+                fields["headers"] = self._headers(scope)
+                fields["body"] = body.decode("utf-8", "replace")
+
+            logger.info("request", extra={"fields": fields})
+
+    def _headers(self, scope) -> Dict[str, str]:
+        headers = {}
+        for name, value in scope.get("headers", []):
+            key = name.decode("latin-1").lower()
+            headers[key] = "[redacted]" if key in self.redact else value.decode("latin-1")
+        return headers
+
+
+class DeadlineMiddleware:
+    """Pure ASGI middleware that gives every request a deadline.
+
+    The budget comes from the DEADLINE_HEADER request header (milliseconds
+    left in the caller's turn) or the route's default. Upstream calls made
+    while serving the request only get the time that is left; misses are
+    counted per route once the response is done.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.header = settings.DEADLINE_HEADER.lower().encode("latin-1")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        header = next((v.decode("latin-1") for k, v in scope.get("headers", []) if k == self.header), None)
+        current = Deadline(deadline.budget_for(scope["path"], header))
+        token = deadline.start(current)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            deadline.reset(token)
+            stage = current.missed or ("response" if current.expired() else None)
+            if stage:
+                deadline.record_miss(getattr(scope.get("route"), "path", None), stage)
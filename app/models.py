@@ -1,7 +1,5 @@
-from locale import currency
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+from typing import Optional, List
 
 class FlightSearchRequest(BaseModel):
     origin: str = Field(..., description="Origin airport code")
@@ -10,6 +8,25 @@ class FlightSearchRequest(BaseModel):
     return_date: Optional[str] = Field(None, description="Return date YYYY-MM-DD")
     adults: Optional[int] = Field(1, description="Number of adult passengers")
 
+class FlexibleFlightSearchRequest(BaseModel):
+    origin: str = Field(..., description="Origin airport code")
+    destination: str = Field(..., description="Destination airport code")
+    departure_date_from: str = Field(..., description="First departure date YYYY-MM-DD")
+    departure_date_to: str = Field(..., description="Last departure date YYYY-MM-DD")
+    return_offset_days: Optional[int] = Field(None, description="Days between departure and return for round trips")
+    adults: Optional[int] = Field(1, description="Number of adult passengers")
+
+class BatchFlightSearchRequest(BaseModel):
+    searches: Optional[List[FlightSearchRequest]] = Field(None, description="Explicit list of searches")
+    origins: Optional[List[str]] = Field(None, description="Origin airport codes, combined with every destination")
+    destinations: Optional[List[str]] = Field(None, description="Destination airport codes, combined with every origin")
+    departure_date: Optional[str] = Field(None, description="Departure date YYYY-MM-DD for origin/destination combinations")
+    return_date: Optional[str] = Field(None, description="Return date YYYY-MM-DD for origin/destination combinations")
+    adults: Optional[int] = Field(1, description="Number of adult passengers")
+
+class AirportLookupRequest(BaseModel):
+    q: str = Field(..., description="Spoken city or airport name, or an IATA code")
+
 class RetellRequest(BaseModel):
     args: FlightSearchRequest
 
@@ -24,9 +41,10 @@ class AmadeusTokenResponse(BaseModel):
 class FlightSegment(BaseModel):
     departure_code: str
     arrival_code: str
-    departure_code: str
+    departure_time: str
     arrival_time: str
     airline_code: str
+    airline_name: Optional[str] = None
     flight_number: str
     duration: str
 
@@ -46,6 +64,9 @@ class FlightSearchResponse(BaseModel):
 class WeatherRequest(BaseModel):
     q: str = Field(..., description="Location query (city name, country, etc.)")
 
+class WeatherBatchRequest(BaseModel):
+    locations: List[str] = Field(..., description="Location queries, e.g. origin, destination and layover")
+
 class ItineraryRequest(BaseModel):
     name: str = Field(..., description="Place name to get itineraries for")
 
@@ -54,5 +75,17 @@ class ExchangeRateRequest(BaseModel):
     to_currency: str = Field(..., alias="to", description="Target currency code (e.g., EUR)")
     amount: float = Field(..., description="Amount to convert")
 
+class BulkExchangeRateRequest(BaseModel):
+    from_currency: str = Field(..., alias="from", description="Source currency code (e.g., USD)")
+    to_currencies: List[str] = Field(..., alias="to", description="Target currency codes (e.g., [EUR, GBP])")
+    amounts: List[float] = Field(..., description="Amounts to convert, e.g. a list of flight prices")
+
 class TimeRequest(BaseModel):
-    timeZone: str = Field(..., description="Timezone identifier (e.g., America/New_York)")
\ No newline at end of file
+    timeZone: str = Field(..., description="Timezone identifier (e.g., America/New_York)")
+class TripBriefRequest(BaseModel):
+    destination: str = Field(..., description="Destination place name, used for weather and place info")
+    timeZone: Optional[str] = Field(None, description="Destination timezone; resolved from the destination if omitted")
+    from_currency: Optional[str] = Field(None, alias="from", description="Traveller's currency code (e.g., USD)")
+    to_currency: Optional[str] = Field(None, alias="to", description="Destination currency code (e.g., EUR)")
+    amount: Optional[float] = Field(1.0, description="Amount to convert")
+    budget_ms: Optional[int] = Field(None, description="Latency budget in milliseconds; sections not done by then are pending")
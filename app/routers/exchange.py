@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
-from app.models import ExchangeRateRequest
+from app.utils.fast_json import FastJSONResponse
+from app.models import ExchangeRateRequest, BulkExchangeRateRequest
 from app.services.exchange import exchange_rate_service
 
 router = APIRouter(prefix="/api/exchange", tags=["exchange"])
@@ -15,16 +15,40 @@ async def convert_currency(exchange_request: ExchangeRateRequest):
             exchange_request.to_currency, 
             exchange_request.amount
         )
-        return JSONResponse(content=result)
+        return FastJSONResponse(content=result)
     
     except HTTPException:
         raise
     except Exception as e:
         print(f"Unexpected error in exchange rate endpoint: {e}")
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=500,
             content={
                 "error": "Sorry, something went wrong with your currency conversion. Please try again.",
                 "details": str(e)
             }
-        )
\ No newline at end of file
+        )
+
+@router.post("/convert/bulk")
+async def convert_currency_bulk(bulk_request: BulkExchangeRateRequest):
+    """Convert many amounts into one or more currencies in one call"""
+    
+    try:
+        result = await exchange_rate_service.convert_bulk(
+            bulk_request.from_currency,
+            bulk_request.to_currencies,
+            bulk_request.amounts
+        )
+        return FastJSONResponse(content=result)
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Unexpected error in bulk exchange rate endpoint: {e}")
+        return FastJSONResponse(
+            status_code=500,
+            content={
+                "error": "Sorry, something went wrong with your currency conversion. Please try again.",
+                "details": str(e)
+            }
+        )
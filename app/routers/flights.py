@@ -1,26 +1,74 @@
-from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import JSONResponse
-from app.models import RetellResponse, FlightSearchRequest
+from fastapi import APIRouter, HTTPException
+from app.utils.fast_json import FastJSONResponse
+from app.models import FlightSearchRequest, FlexibleFlightSearchRequest, BatchFlightSearchRequest, AirportLookupRequest
 from app.services.flight import flight_service
-from app.services.retell import retell_service
-import json
+from app.services.airports import airport_index
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/flights", tags=["flights"])
 
 @router.post("/search")
-async def search_flights(flight_request: FlightSearchRequest):
+async def search_flights(flight_request: FlightSearchRequest, raw: bool = False):
     """Main endpoint for flight search from Retell AI"""
 
     try:
         print(f"Received request: {flight_request.model_dump()}")
 
-        result = await flight_service.search_flights(flight_request)
-        return JSONResponse(content=result)
+        result = await flight_service.search_flights(flight_request, raw=raw)
+        return FastJSONResponse(content=result)
 
     except HTTPException:
         raise
     except Exception as e:
         print(f"Unexpected error: {e}")
-        return JSONResponse(content={
+        return FastJSONResponse(content={
         "error": "Sorry, something went wrong with your flight search. Please try again."
         })
+
+@router.post("/search/flexible")
+async def search_flexible_dates(flex_request: FlexibleFlightSearchRequest):
+    """Search a window of departure dates and return the cheapest offer per day"""
+
+    try:
+        logger.debug(f"Received flexible request: {flex_request.model_dump()}")
+
+        result = await flight_service.search_flexible_dates(flex_request)
+        return FastJSONResponse(content=result)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Unexpected error: {e}")
+        return FastJSONResponse(content={
+        "error": "Sorry, something went wrong with your flight search. Please try again."
+        })
+
+@router.post("/search/batch")
+async def search_batch(batch_request: BatchFlightSearchRequest):
+    """Search several origin/destination pairs in one request"""
+
+    try:
+        logger.debug(f"Received batch request: {batch_request.model_dump()}")
+
+        result = await flight_service.search_batch(batch_request)
+        return FastJSONResponse(content=result)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Unexpected error: {e}")
+        return FastJSONResponse(content={
+        "error": "Sorry, something went wrong with your flight search. Please try again."
+        })
+
+@router.post("/airports/lookup")
+async def lookup_airports(lookup_request: AirportLookupRequest):
+    """Resolve a spoken place name to IATA codes without calling Amadeus"""
+
+    return FastJSONResponse(content={
+        "query": lookup_request.q,
+        "resolved": airport_index.resolve(lookup_request.q),
+        "matches": airport_index.search(lookup_request.q)
+    })
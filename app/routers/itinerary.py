@@ -1,23 +1,23 @@
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+from app.utils.fast_json import FastJSONResponse
 from app.models import ItineraryRequest
 from app.services.itinerary import itinerary_service
 
 router = APIRouter(prefix="/api/itinerary", tags=["itinerary"])
 
 @router.post("/places")
-async def get_itineraries(itinerary_request: ItineraryRequest):
-    """Get itineraries for a given place"""
+async def get_itineraries(itinerary_request: ItineraryRequest, raw: bool = False):
+    """Get itineraries for a given place, with the upstream payload in raw_data if raw is set"""
     
     try:
-        result = await itinerary_service.get_itineraries(itinerary_request.name)
-        return JSONResponse(content=result)
+        result = await itinerary_service.get_itineraries(itinerary_request.name, include_raw=raw)
+        return FastJSONResponse(content=result)
     
     except HTTPException:
         raise
     except Exception as e:
         print(f"Unexpected error in itinerary endpoint: {e}")
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=500,
             content={
                 "error": "Sorry, something went wrong with your itinerary request. Please try again.",
@@ -1,9 +1,13 @@
-from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, Request, WebSocket, WebSocketDisconnect
+from app.utils import fast_json
+from app.utils.fast_json import FastJSONResponse
 from app.services.retell import retell_service
+from app.services.retell_llm import RetellLLMSession
 from app.config import settings
-import json
 from typing import Dict, Any
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/retell", tags=["retell"])
 
@@ -19,15 +23,16 @@ async def retell_agent_endpoint(agent_id: str, request: Request):
         if not body:
             raise HTTPException(status_code=400, detail="Request body is required")
         
+        # Verify Retell signature on the raw bytes before parsing anything
+        signature = request.headers.get("X-Retell-Signature", "")
+        if not retell_service.verify_signature(body, signature):
+            raise HTTPException(status_code=401, detail="Invalid signature")
+        
         try:
-            post_data = json.loads(body.decode())
-        except json.JSONDecodeError:
+            post_data = fast_json.loads(body)
+        except ValueError:
             raise HTTPException(status_code=400, detail="Invalid JSON in request body")
         
-        # Verify Retell signature if enabled
-        if not await retell_service.verify_signature(request, post_data):
-            raise HTTPException(status_code=401, detail="Invalid signature")
-        
         # Validate that this matches the expected agent_id
         expected_agent_id = "agent_bda99a1b4a3929766994d78bae"
         if agent_id != expected_agent_id:
@@ -42,7 +47,7 @@ async def retell_agent_endpoint(agent_id: str, request: Request):
             "response_id": post_data.get("response_id", 1)
         }
         
-        return JSONResponse(content=response_data)
+        return FastJSONResponse(content=response_data)
         
     except HTTPException:
         raise
@@ -50,6 +55,35 @@ async def retell_agent_endpoint(agent_id: str, request: Request):
         print(f"Error in retell agent endpoint: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@router.websocket("/llm-websocket/{call_id}")
+async def retell_llm_websocket(websocket: WebSocket, call_id: str):
+    """
+    Retell custom LLM WebSocket, one connection per call
+    Streams partial responses and cancels work superseded by a newer response_id
+    """
+    await websocket.accept()
+    session = RetellLLMSession(call_id, lambda message: websocket.send_text(fast_json.dumps(message).decode()))
+
+    try:
+        await session.start()
+
+        while True:
+            message = await websocket.receive_text()
+            try:
+                event = fast_json.loads(message)
+            except ValueError:
+                logger.warning(f"Ignoring invalid JSON from Retell call {call_id}")
+                continue
+
+            await session.handle(event)
+
+    except WebSocketDisconnect:
+        pass
+    except Exception:
+        logger.exception(f"Error in retell llm websocket for call {call_id}")
+    finally:
+        await session.close()
+
 @router.get("/agent/{agent_id}/health")
 async def retell_agent_health(agent_id: str):
     """
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, HTTPException
+from app.utils.fast_json import FastJSONResponse
+from app.models import TripBriefRequest
+from app.services.trip_brief import trip_brief_service
+
+router = APIRouter(prefix="/api/trip", tags=["trip"])
+
+@router.post("/brief")
+async def get_trip_brief(brief_request: TripBriefRequest):
+    """Weather, local time, currency and place info for a destination within one latency budget"""
+
+    try:
+        result = await trip_brief_service.get_brief(
+            brief_request.destination,
+            timezone=brief_request.timeZone,
+            from_currency=brief_request.from_currency,
+            to_currency=brief_request.to_currency,
+            amount=brief_request.amount if brief_request.amount is not None else 1.0,
+            budget_ms=brief_request.budget_ms
+        )
+        return FastJSONResponse(content=result)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Unexpected error in trip brief endpoint: {e}")
+        return FastJSONResponse(
+            status_code=500,
+            content={
+                "error": "Sorry, something went wrong with your trip brief. Please try again.",
+                "details": str(e)
+            }
+        )
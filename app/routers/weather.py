@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
-from app.models import WeatherRequest
+from app.utils.fast_json import FastJSONResponse
+from app.models import WeatherRequest, WeatherBatchRequest
 from app.services.weather import weather_service
 
 router = APIRouter(prefix="/api/weather", tags=["weather"])
@@ -11,16 +11,36 @@ async def get_weather(weather_request: WeatherRequest):
     
     try:
         result = await weather_service.get_current_weather(weather_request.q)
-        return JSONResponse(content=result)
+        return FastJSONResponse(content=result)
     
     except HTTPException:
         raise
     except Exception as e:
         print(f"Unexpected error in weather endpoint: {e}")
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=500,
             content={
                 "error": "Sorry, something went wrong with your weather request. Please try again.",
                 "details": str(e)
             }
-        )
\ No newline at end of file
+        )
+
+@router.post("/batch")
+async def get_weather_batch(batch_request: WeatherBatchRequest):
+    """Get current weather for several locations in one call"""
+    
+    try:
+        result = await weather_service.get_weather_batch(batch_request.locations)
+        return FastJSONResponse(content=result)
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Unexpected error in weather batch endpoint: {e}")
+        return FastJSONResponse(
+            status_code=500,
+            content={
+                "error": "Sorry, something went wrong with your weather request. Please try again.",
+                "details": str(e)
+            }
+        )
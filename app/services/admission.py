@@ -0,0 +1,250 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+import httpx
+from app.config import settings
+from app.utils import deadline
+from app.utils.metrics import upstream_admission_rejections, upstream_queue_depth, upstream_queue_wait
+import logging
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE, BACKGROUND = 0, 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+# Priority of the work in progress: interactive unless run under background()
+_priority: ContextVar[int] = ContextVar("admission_priority", default=INTERACTIVE)
+
+
+class AdmissionRejected(httpx.TransportError):
+    """Raised without calling the upstream when its wait queue is full"""
+
+
+@contextmanager
+def background():
+    """Run the block as background work: lowest priority and no request deadline"""
+
+    priority_token = _priority.set(BACKGROUND)
+    deadline_token = deadline.start(None)
+    try:
+        yield
+    finally:
+        deadline.reset(deadline_token)
+        _priority.reset(priority_token)
+
+
+class UpstreamScheduler:
+    """Concurrency cap and token-bucket rate limit for one upstream, with a bounded wait queue.
+
+    Calls that cannot start at once wait in priority order, interactive
+    before background and then first come first served. A full queue
+    rejects new calls right away. The exception is an interactive call
+    arriving while background calls wait: it takes the newest one's place.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, rate: float, burst: int, max_queue: int):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.max_queue = max_queue
+        self.tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+        self.active = 0
+        # Heap of [priority, arrival, future]; entries whose future is done are skipped
+        self._waiters: List[list] = []
+        self._arrivals = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.depth = 0
+
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one of the upstream's slots for the duration of the block"""
+
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self):
+        """Wait for a slot; raise AdmissionRejected or DeadlineExceeded instead of waiting forever"""
+
+        priority = _priority.get()
+
+        if not self.depth and self._can_start():
+            self._start()
+            upstream_queue_wait.observe(0.0, self.name, PRIORITY_NAMES[priority])
+            return
+
+        if self.depth >= self.max_queue and not self._displace(priority):
+            self._reject("queue_full")
+            raise AdmissionRejected(f"{self.name} admission queue is full ({self.max_queue} waiting)")
+
+        future = asyncio.get_running_loop().create_future()
+        entry = [priority, next(self._arrivals), future]
+        heapq.heappush(self._waiters, entry)
+        self.depth += 1
+        self.queued += 1
+        self._dispatch()
+
+        start = time.monotonic()
+        try:
+            # Never queue past the request's deadline
+            await asyncio.wait({future}, timeout=deadline.remaining())
+        except asyncio.CancelledError:
+            self._abandon(future)
+            raise
+        finally:
+            waited = time.monotonic() - start
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+            upstream_queue_wait.observe(waited, self.name, PRIORITY_NAMES[priority])
+
+        if not future.done():
+            self._abandon(future)
+            self._reject("deadline")
+            raise deadline.exceeded(self.name)
+
+        # Raises AdmissionRejected if an interactive call took this place
+        future.result()
+
+    def release(self):
+        self.active -= 1
+        self._dispatch()
+
+    def _refill(self):
+        if self.rate <= 0:
+            return
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def _can_start(self) -> bool:
+        if self.active >= self.max_concurrency:
+            return False
+        self._refill()
+        return self.rate <= 0 or self.tokens >= 1
+
+    def _start(self):
+        self.active += 1
+        self.admitted += 1
+        if self.rate > 0:
+            self.tokens -= 1
+
+    def _dispatch(self):
+        """Hand free slots to waiters in priority order, or wake up when the next token is due"""
+
+        while self._waiters:
+            future = self._waiters[0][2]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if not self._can_start():
+                break
+            heapq.heappop(self._waiters)
+            self.depth -= 1
+            self._start()
+            future.set_result(None)
+
+        if self.depth and self.rate > 0 and self.active < self.max_concurrency and self._timer is None:
+            # Only the rate limit holds the queue back: retry once a token has refilled
+            delay = max((1 - self.tokens) / self.rate, 0.001)
+            self._timer = asyncio.get_running_loop().call_later(delay, self._on_timer)
+
+        upstream_queue_depth.set(self.name, value=self.depth)
+
+    def _on_timer(self):
+        self._timer = None
+        self._dispatch()
+
+    def _abandon(self, future: asyncio.Future):
+        """Drop a waiter that gave up, returning the slot if it was granted meanwhile"""
+
+        if future.done():
+            if not future.cancelled() and future.exception() is None:
+                self.release()
+            return
+
+        future.cancel()
+        self.depth -= 1
+        upstream_queue_depth.set(self.name, value=self.depth)
+
+    def _displace(self, priority: int) -> bool:
+        """Reject the newest waiter of lower priority to make room; False if there is none"""
+
+        candidates = [entry for entry in self._waiters if entry[0] > priority and not entry[2].done()]
+        if not candidates:
+            return False
+
+        victim = max(candidates, key=lambda entry: (entry[0], entry[1]))
+        victim[2].set_exception(AdmissionRejected(f"{self.name} admission queue is full, displaced by higher priority work"))
+        self.depth -= 1
+        self._reject("displaced")
+        return True
+
+    def _reject(self, reason: str):
+        self.rejected += 1
+        upstream_admission_rejections.inc(self.name, reason)
+
+    def stats(self) -> Dict[str, Any]:
+        self._refill()
+        return {
+            "active": self.active,
+            "max_concurrency": self.max_concurrency,
+            "queue_depth": self.depth,
+            "max_queue": self.max_queue,
+            "rate_per_second": self.rate,
+            "tokens": round(self.tokens, 2) if self.rate > 0 else None,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "mean_wait_ms": round(self.wait_total / self.queued * 1000, 2) if self.queued else 0.0,
+            "max_wait_ms": round(self.wait_max * 1000, 2)
+        }
+
+
+class AdmissionController:
+    """One scheduler per upstream, built from the admission settings on first use"""
+
+    def __init__(self):
+        self._schedulers: Dict[str, UpstreamScheduler] = {}
+
+    def scheduler(self, upstream: str) -> UpstreamScheduler:
+        scheduler = self._schedulers.get(upstream)
+        if scheduler is None:
+            scheduler = self._schedulers[upstream] = UpstreamScheduler(
+                upstream,
+                max_concurrency=settings.UPSTREAM_MAX_CONCURRENCY.get(upstream, settings.HTTP_MAX_CONNECTIONS),
+                rate=settings.UPSTREAM_RATE_LIMITS.get(upstream, 0.0),
+                burst=settings.UPSTREAM_RATE_BURSTS.get(upstream, 1),
+                max_queue=settings.UPSTREAM_QUEUE_SIZE
+            )
+        return scheduler
+
+    @asynccontextmanager
+    async def slot(self, upstream: str):
+        """Hold an admission slot for one upstream call"""
+
+        if not settings.ADMISSION_ENABLED:
+            yield
+            return
+
+        async with self.scheduler(upstream).slot():
+            yield
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {upstream: scheduler.stats() for upstream, scheduler in self._schedulers.items()}
+
+
+admission = AdmissionController()
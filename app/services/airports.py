@@ -0,0 +1,243 @@
+import csv
+import difflib
+import os
+import unicodedata
+from bisect import bisect_left
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+
+# difflib cutoff for fuzzy matches, and how many trigram candidates it compares at most
+_FUZZY_CUTOFF = 0.75
+_FUZZY_CANDIDATES = 50
+
+# Words that don't help tell places apart ("Heathrow Airport" -> "heathrow")
+# "city" stays: it is part of names like Kansas City and Mexico City
+_STOP_WORDS = {"airport", "airports", "international", "intl", "the", "of"}
+
+
+def normalize_place(text: str) -> str:
+    """Lowercase, strip accents and punctuation, drop filler words"""
+
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    words = "".join(c if c.isalnum() else " " for c in text.lower()).split()
+    kept = [w for w in words if w not in _STOP_WORDS]
+    return " ".join(kept or words)
+
+
+def _trigrams(key: str) -> set:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass(frozen=True)
+class Place:
+    code: str
+    name: str
+    city: str
+    country: str
+    kind: str
+    metro: Optional[str] = None
+
+
+class AirportIndex:
+    """In-memory airport and metro-area index loaded lazily from app/data.
+
+    Exact code and name lookups are dict hits; prefix search bisects a
+    sorted key list and fuzzy search runs difflib over the names sharing
+    the most trigrams with the query.
+    """
+
+    def __init__(self, data_dir: str = DATA_DIR):
+        self.data_dir = data_dir
+        self._loaded = False
+        self._airports: Dict[str, Place] = {}
+        self._metros: Dict[str, Place] = {}
+        self._metro_members: Dict[str, List[str]] = {}
+        self._names: Dict[str, List[Tuple[int, str]]] = {}
+        self._sorted_names: List[str] = []
+        self._trigram_names: Dict[str, List[str]] = {}
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self.load()
+
+    def load(self):
+        """Read the bundled CSV files and build the lookup tables"""
+
+        with open(os.path.join(self.data_dir, "metros.csv"), newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                metro = Place(row["code"], row["city"], row["city"], row["country"], "metro")
+                self._metros[metro.code] = metro
+                self._metro_members[metro.code] = []
+                self._add_name(row["city"], metro.code, 0)
+                for alias in filter(None, row["aliases"].split("|")):
+                    self._add_name(alias, metro.code, 0)
+
+        with open(os.path.join(self.data_dir, "airports.csv"), newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                airport = Place(row["code"], row["name"], row["city"], row["country"], "airport",
+                                row["metro"] or None)
+                self._airports[airport.code] = airport
+                if airport.metro in self._metro_members:
+                    self._metro_members[airport.metro].append(airport.code)
+
+                # Metro city names were added first, so "London" stays LON
+                self._add_name(row["city"], airport.code, 2)
+                self._add_name(row["name"], airport.code, 1)
+                self._add_name(f"{row['city']} {row['name']}", airport.code, 1)
+                for alias in filter(None, row["aliases"].split("|")):
+                    self._add_name(alias, airport.code, 1)
+                    self._add_name(f"{row['city']} {alias}", airport.code, 1)
+
+        for key in self._names:
+            self._names[key].sort()
+        self._sorted_names = sorted(self._names)
+        for key in self._sorted_names:
+            for gram in _trigrams(key):
+                self._trigram_names.setdefault(gram, []).append(key)
+        self._loaded = True
+
+        logger.info(f"Airport index loaded: {len(self._airports)} airports, {len(self._metros)} metro areas")
+
+    def _add_name(self, name: str, code: str, priority: int):
+        key = normalize_place(name)
+        if not key:
+            return
+
+        entries = self._names.setdefault(key, [])
+        if all(existing != code for _, existing in entries):
+            entries.append((priority, code))
+
+    def get(self, code: str) -> Optional[Place]:
+        """Exact lookup by airport or metro IATA code"""
+
+        self._ensure_loaded()
+        code = code.strip().upper()
+        return self._metros.get(code) or self._airports.get(code)
+
+    def metro_airports(self, code: str) -> List[Place]:
+        """Airports grouped under a metro code, e.g. NYC -> JFK, LGA, EWR"""
+
+        self._ensure_loaded()
+        return [self._airports[c] for c in self._metro_members.get(code.strip().upper(), [])]
+
+    def _codes_for_key(self, key: str) -> List[str]:
+        return [code for _, code in self._names.get(key, [])]
+
+    def prefix(self, text: str, limit: int = 5) -> List[str]:
+        """Codes whose names start with text"""
+
+        self._ensure_loaded()
+        key = normalize_place(text)
+        if not key:
+            return []
+
+        codes: List[str] = []
+        i = bisect_left(self._sorted_names, key)
+        while i < len(self._sorted_names) and self._sorted_names[i].startswith(key):
+            for code in self._codes_for_key(self._sorted_names[i]):
+                if code not in codes:
+                    codes.append(code)
+            if len(codes) >= limit:
+                break
+            i += 1
+
+        return codes[:limit]
+
+    def _fuzzy_candidates(self, key: str) -> List[str]:
+        """Names sharing the most trigrams with key, within the length difflib's cutoff allows"""
+
+        # ratio = 2 * matches / (len(a) + len(b)) can only reach the cutoff for similar lengths
+        shortest = len(key) * _FUZZY_CUTOFF / (2 - _FUZZY_CUTOFF)
+        longest = len(key) * (2 - _FUZZY_CUTOFF) / _FUZZY_CUTOFF
+
+        shared: Dict[str, int] = {}
+        for gram in _trigrams(key):
+            for name in self._trigram_names.get(gram, ()):
+                if shortest <= len(name) <= longest:
+                    shared[name] = shared.get(name, 0) + 1
+
+        return sorted(shared, key=shared.get, reverse=True)[:_FUZZY_CANDIDATES]
+
+    def fuzzy(self, text: str, limit: int = 5) -> List[str]:
+        """Codes whose names are close to text (handles misspellings)"""
+
+        self._ensure_loaded()
+        return list(_fuzzy_lookup(self, normalize_place(text), limit))
+
+    def resolve(self, text: str) -> Optional[str]:
+        """IATA code for an exact code or place name, or None.
+
+        Prefix and fuzzy hits are only guesses ("Kansas City" is close to
+        "Kansai"), so they are left to search() for the caller to confirm.
+        """
+
+        self._ensure_loaded()
+        raw = text.strip()
+        if not raw:
+            return None
+
+        upper = raw.upper()
+        if len(upper) == 3 and upper.isalpha() and (upper in self._airports or upper in self._metros):
+            return upper
+
+        codes = self._codes_for_key(normalize_place(raw))
+        if codes:
+            return codes[0]
+
+        # Unknown three-letter codes are passed through; the dataset is not exhaustive
+        if len(upper) == 3 and upper.isalpha():
+            return upper
+
+        return None
+
+    def search(self, text: str, limit: int = 5) -> List[Dict[str, object]]:
+        """Matching places, exact matches first, for disambiguation"""
+
+        self._ensure_loaded()
+        codes: List[str] = []
+        place = self.get(text) if len(text.strip()) == 3 else None
+        if place:
+            codes.append(place.code)
+
+        for code in (self._codes_for_key(normalize_place(text)) + self.prefix(text, limit)
+                     + self.fuzzy(text, limit)):
+            if code not in codes:
+                codes.append(code)
+
+        return [self.describe(code) for code in codes[:limit]]
+
+    def describe(self, code: str) -> Dict[str, object]:
+        """Serializable description of a place"""
+
+        place = self.get(code)
+        result: Dict[str, object] = {
+            "code": place.code,
+            "name": place.name,
+            "city": place.city,
+            "country": place.country,
+            "type": place.kind
+        }
+        if place.kind == "metro":
+            result["airports"] = self._metro_members.get(place.code, [])
+        return result
+
+
+@lru_cache(maxsize=1024)
+def _fuzzy_lookup(index: AirportIndex, key: str, limit: int) -> Tuple[str, ...]:
+    codes: List[str] = []
+    candidates = index._fuzzy_candidates(key)
+    for match in difflib.get_close_matches(key, candidates, n=limit, cutoff=_FUZZY_CUTOFF):
+        for code in index._codes_for_key(match):
+            if code not in codes:
+                codes.append(code)
+    return tuple(codes[:limit])
+
+
+airport_index = AirportIndex()
@@ -1,8 +1,22 @@
-import httpx
+import asyncio
+import os
+import time
 from datetime import datetime, timedelta
 from typing import Optional,Dict,Any
 from app.config import settings
-from app.models import AmadeusTokenResponse
+from app.utils import fast_json
+from app.services.admission import background
+from app.services.http_client import http_client_manager
+from app.utils.cache_backend import create_cache
+from app.utils.coalesce import RequestCoalescer
+from app.utils.metrics import token_refreshes
+from app.utils.negative_cache import negative_cache
+import logging
+
+logger = logging.getLogger(__name__)
+
+class InvalidSearchError(ValueError):
+    """Amadeus rejected the search parameters (HTTP 400)"""
 
 class AmadeusService:
     def __init__(self):
@@ -10,9 +24,16 @@ class AmadeusService:
             "token": None,
             "expires_at": None
         }
+        self._token_refresh: Optional[asyncio.Task] = None
+        self._refresher_task: Optional[asyncio.Task] = None
+        self._search_coalescer = RequestCoalescer("amadeus_flights")
+        # Shared with the other workers when CACHE_BACKEND is sqlite; read through every time
+        self._token_store = create_cache(
+            "amadeus_token", maxsize=4, ttl=settings.AMADEUS_TOKEN_CACHE_TIME, local_ttl=0
+        )
 
-    async def get_access_token(self) -> str:
-        """Get or Access Amadeus API Token"""
+    def _cached_token(self) -> Optional[str]:
+        """Return the cached token if it is still valid"""
 
         if(self._token_cache["token"] and
            self._token_cache["expires_at"] and
@@ -20,39 +41,175 @@ class AmadeusService:
 
            return self._token_cache["token"]
 
-    
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                settings.AMADEUS_TOKEN_URL,
-                headers = {
-                    "Content-Type": "application/x-www-form-urlencoded"
-                },
-                data={
-                    "grant_type": "client_credentials",
-                    "client_id": settings.AMADEUS_API_KEY,
-                    "client_secret": settings.AMADEUS_API_SECRET
-                },
-                timeout=settings.REQUEST_TIMEOUT
-            )
-
-            if response.status_code != 200:
-                raise Exception(f"Token request failed: {response.status_code}")
-
-            token_data = response.json()
-
-            token = token_data["access_token"]
-            expires_in = token_data.get("expires_in", settings.AMADEUS_TOKEN_CACHE_TIME)
-
-            #Cache Token
-            self._token_cache["token"] = token
-            self._token_cache["expires_at"] = datetime.now() + timedelta(seconds = expires_in - 60)
+        return None
+
+    def invalidate_token(self):
+        """Drop the cached token so the next call fetches a new one"""
+
+        self._token_cache["token"] = None
+        self._token_cache["expires_at"] = None
+
+    async def get_access_token(self, force_refresh: bool = False, rejected: Optional[str] = None) -> str:
+        """Get or Access Amadeus API Token, never handing back a token the API rejected"""
+
+        if not force_refresh:
+            token = self._cached_token()
+            if token:
+                return token
 
+        # Single-flight: concurrent callers share one in-flight refresh
+        if self._token_refresh is None or self._token_refresh.done():
+            if rejected is None and force_refresh:
+                rejected = self._token_cache["token"]
+            self._token_refresh = asyncio.ensure_future(self._fetch_token(rejected))
+
+        return await asyncio.shield(self._token_refresh)
+
+    async def _fetch_token(self, rejected: Optional[str] = None) -> str:
+        """Adopt a token another worker already fetched, or request a new one"""
+
+        token = await self._shared_token(exclude=rejected)
+        if token:
             return token
 
+        # One worker holds the refresh lease; the others wait for its token
+        holds_lease = await self._token_store.add("refresh_lease", os.getpid(), ttl=settings.AMADEUS_TOKEN_LEASE_TIME)
+        if not holds_lease:
+            token = await self._wait_for_shared_token(exclude=rejected)
+            if token:
+                return token
+
+        try:
+            token = await self._request_token()
+        except Exception:
+            token_refreshes.inc("failure")
+            raise
+        finally:
+            # Another worker's lease is left to expire on its own
+            if holds_lease:
+                await self._token_store.delete("refresh_lease")
+
+        token_refreshes.inc("success")
+        return token
+
+    async def _shared_token(self, exclude: Optional[str] = None) -> Optional[str]:
+        """Valid token from the token store, cached locally, unless it is the one being replaced"""
+
+        entry = await self._token_store.get("access_token")
+        if not entry or entry["token"] == exclude or entry["expires_at"] <= time.time():
+            return None
+
+        self._token_cache["token"] = entry["token"]
+        self._token_cache["expires_at"] = datetime.fromtimestamp(entry["expires_at"])
+        return entry["token"]
+
+    async def _wait_for_shared_token(self, exclude: Optional[str] = None) -> Optional[str]:
+        """Poll for the lease holder's token until the lease runs out"""
+
+        deadline = time.monotonic() + settings.AMADEUS_TOKEN_LEASE_TIME
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+            token = await self._shared_token(exclude=exclude)
+            if token:
+                return token
+
+        return None
+
+    async def _request_token(self) -> str:
+        """Call the OAuth endpoint and cache the token"""
+
+        response = await http_client_manager.request(
+            "amadeus", "POST",
+            settings.AMADEUS_TOKEN_URL,
+            headers = {
+                "Content-Type": "application/x-www-form-urlencoded"
+            },
+            data={
+                "grant_type": "client_credentials",
+                "client_id": settings.AMADEUS_API_KEY,
+                "client_secret": settings.AMADEUS_API_SECRET
+            },
+            timeout=settings.REQUEST_TIMEOUT
+        )
+
+        if response.status_code != 200:
+            raise Exception(f"Token request failed: {response.status_code}")
+
+        token_data = fast_json.loads(response.content)
+
+        token = token_data["access_token"]
+        expires_in = token_data.get("expires_in", settings.AMADEUS_TOKEN_CACHE_TIME)
+
+        #Cache Token
+        self._token_cache["token"] = token
+        self._token_cache["expires_at"] = datetime.now() + timedelta(seconds = expires_in - 60)
+        await self._token_store.set(
+            "access_token",
+            {"token": token, "expires_at": self._token_cache["expires_at"].timestamp()},
+            ttl=expires_in - 60
+        )
+
+        return token
+
+    def start_token_refresher(self):
+        """Start renewing the token in the background before it expires"""
+
+        if not (settings.AMADEUS_API_KEY and settings.AMADEUS_API_SECRET):
+            return
+
+        if self._refresher_task is None or self._refresher_task.done():
+            # The task copies the context, so its upstream calls queue as background work
+            with background():
+                self._refresher_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop_token_refresher(self):
+        """Cancel the background refresh task"""
+
+        task, self._refresher_task = self._refresher_task, None
+        if task is None:
+            return
+
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _refresh_loop(self):
+        """Keep a valid token cached so searches never wait on the token endpoint"""
+
+        while True:
+            try:
+                await self.get_access_token(force_refresh=self._cached_token() is None)
+
+                expires_at = self._token_cache["expires_at"]
+                delay = (expires_at - datetime.now()).total_seconds() - settings.AMADEUS_TOKEN_REFRESH_MARGIN
+                await asyncio.sleep(max(delay, 1))
+
+                await self.get_access_token(force_refresh=True)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Background Amadeus token refresh failed: {e}")
+                await asyncio.sleep(settings.AMADEUS_TOKEN_RETRY_INTERVAL)
+
     async def search_flights(self, search_params: Dict[str, Any]) -> Dict[str, Any]:
         """Search flights using Amadeus API"""
 
-        token = await self.get_access_token()
+        key = tuple(sorted((k, v) for k, v in search_params.items() if v is not None))
+
+        rejected = await negative_cache.get("amadeus", key)
+        if rejected is not None:
+            raise InvalidSearchError(rejected[1])
+
+        try:
+            return await self._search_coalescer.run(key, lambda: self._search_flights(search_params))
+        except InvalidSearchError as e:
+            await negative_cache.remember("amadeus", key, 400, str(e))
+            raise
+
+    async def _search_flights(self, search_params: Dict[str, Any]) -> Dict[str, Any]:
+        """Call the Amadeus flight-offers endpoint"""
 
         params = {
             "originLocationCode": search_params.get("origin",""),
@@ -66,23 +223,37 @@ class AmadeusService:
         if search_params.get("return_date"):
             params["returnDate"] = search_params["return_date"]
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                settings.AMADEUS_FLIGHT_URL,
-                headers = {
-                    "Authorization": f"Bearer {token}",
-                    "Content-Type": "application/json"
-                },
-                params = params,
-                timeout = settings.REQUEST_TIMEOUT
-            )
-
-            if response.status_code == 200:
-                return response.json()
-            elif response.status_code == 400:
-                error_data = response.json()
-                raise ValueError(f"Invalid request: {error_data}")
-            else:
-                raise Exception(f"Flight search failed: {response.status_code}")
-
-amadeus_service = AmadeusService()
\ No newline at end of file
+        token = await self.get_access_token()
+        response = await self._request_flights(token, params)
+
+        # Token revoked or expired early: refresh once and retry
+        if response.status_code == 401:
+            logger.warning("Amadeus returned 401, refreshing token and retrying")
+            self.invalidate_token()
+            # The store may still hold the revoked token, so name it explicitly
+            token = await self.get_access_token(force_refresh=True, rejected=token)
+            response = await self._request_flights(token, params)
+
+        if response.status_code == 200:
+            return fast_json.loads(response.content)
+        elif response.status_code == 400:
+            error_data = fast_json.loads(response.content)
+            raise InvalidSearchError(f"Invalid request: {error_data}")
+        else:
+            raise Exception(f"Flight search failed: {response.status_code}")
+
+    async def _request_flights(self, token: str, params: Dict[str, Any]):
+        """Call the flight-offers endpoint with the given token"""
+
+        return await http_client_manager.request(
+            "amadeus", "GET",
+            settings.AMADEUS_FLIGHT_URL,
+            headers = {
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json"
+            },
+            params = params,
+            timeout = settings.REQUEST_TIMEOUT
+        )
+
+amadeus_service = AmadeusService()
@@ -1,55 +1,153 @@
 import httpx
+import time
+from typing import List, Optional
 from fastapi import HTTPException
 from app.config import settings
+from app.utils import fast_json
+from app.services.http_client import http_client_manager
+from app.utils.cache_backend import create_cache
+from app.utils.coalesce import RequestCoalescer
+from app.utils.negative_cache import negative_cache
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Rates are shown to this many significant digits; small cross rates like VND/KWD need them
+RATE_SIGNIFICANT_DIGITS = 6
+
+# ExchangeRate error types caused by our account, not the caller's input: never negatively cached
+ACCOUNT_ERRORS = {"invalid-key": 503, "inactive-account": 503, "quota-reached": 429}
+
 class ExchangeRateService:
     def __init__(self):
-        self.base_url = "https://v6.exchangerate-api.com/v6"
-        
+        self.base_url = settings.EXCHANGERATE_BASE_URL
+        self._coalescer = RequestCoalescer("exchangerate")
+        self._tables = create_cache(
+            "exchange_rate_tables",
+            maxsize=settings.EXCHANGE_RATE_TABLE_CACHE_SIZE,
+            ttl=settings.EXCHANGE_RATE_CACHE_TTL
+        )
+
     async def convert_currency(self, from_currency: str, to_currency: str, amount: float) -> dict:
-        """Convert currency using ExchangeRate API"""
-        
+        """Convert currency using a cached ExchangeRate API rate table"""
+
+        from_currency = from_currency.strip().upper()
+        to_currency = to_currency.strip().upper()
+
+        table = await self.get_rate_table()
+        rate = self._cross_rate(table, from_currency, to_currency)
+
+        data = {
+            "result": "success",
+            "base_code": from_currency,
+            "target_code": to_currency,
+            "conversion_rate": self._display_rate(rate),
+            "conversion_result": round(amount * rate, 4),
+            "time_last_update_utc": table.get("time_last_update_utc"),
+            "time_next_update_utc": table.get("time_next_update_utc")
+        }
+        return self._format_exchange_response(data, from_currency, to_currency, amount)
+
+    async def convert_bulk(self, from_currency: str, to_currencies: List[str], amounts: List[float]) -> dict:
+        """Convert many amounts into one or more currencies from a single rate table"""
+
+        from_currency = from_currency.strip().upper()
+        targets = [currency.strip().upper() for currency in to_currencies]
+
+        table = await self.get_rate_table()
+        rates = {target: self._cross_rate(table, from_currency, target) for target in targets}
+
+        return {
+            "from_currency": from_currency,
+            "rates": {target: self._display_rate(rate) for target, rate in rates.items()},
+            "conversions": [
+                {
+                    "original_amount": amount,
+                    "converted": {target: round(amount * rate, 4) for target, rate in rates.items()}
+                }
+                for amount in amounts
+            ],
+            "api_info": {
+                "base_code": table.get("base_code"),
+                "time_last_update": table.get("time_last_update_utc"),
+                "time_next_update": table.get("time_next_update_utc")
+            }
+        }
+
+    def _cross_rate(self, table: dict, from_currency: str, to_currency: str) -> float:
+        """Rate between any two currencies, computed through the table's base currency"""
+
+        rates = table.get("conversion_rates") or {}
+        if from_currency not in rates or to_currency not in rates:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Currency pair {from_currency}/{to_currency} not found"
+            )
+
+        # Full precision: rounding here would carry into every converted amount
+        return rates[to_currency] / rates[from_currency]
+
+    def _display_rate(self, rate: float) -> float:
+        return float(f"{rate:.{RATE_SIGNIFICANT_DIGITS}g}")
+
+    async def get_rate_table(self, base_currency: Optional[str] = None) -> dict:
+        """Full rate table for a base currency, cached until the provider's next update"""
+
         if not settings.EXCHANGERATE_API_KEY:
             raise HTTPException(
                 status_code=500,
                 detail="ExchangeRate API key not configured"
             )
-        
-        # Build URL with API key and parameters
-        url = f"{self.base_url}/{settings.EXCHANGERATE_API_KEY}/pair/{from_currency}/{to_currency}/{amount}"
-        
+
+        base_currency = (base_currency or settings.EXCHANGE_RATE_BASE_CURRENCY).upper()
+
+        table = await self._tables.get(base_currency)
+        if table is not None:
+            return table
+
+        await negative_cache.check("exchangerate", base_currency)
+        try:
+            return await self._coalescer.run(base_currency, lambda: self._fetch_rate_table(base_currency))
+        except HTTPException as e:
+            await negative_cache.remember("exchangerate", base_currency, e.status_code, e.detail)
+            raise
+        except httpx.TimeoutException:
+            # Our deadline passed while a shared call was still running
+            raise HTTPException(
+                status_code=408,
+                detail="Exchange rate service timeout"
+            )
+
+    async def _fetch_rate_table(self, base_currency: str) -> dict:
+        """Call the ExchangeRate latest endpoint"""
+
+        # Build URL with API key and base currency
+        url = f"{self.base_url}/{settings.EXCHANGERATE_API_KEY}/latest/{base_currency}"
+
         try:
-            async with httpx.AsyncClient(timeout=settings.REQUEST_TIMEOUT) as client:
-                response = await client.get(url)
-                
-                if response.status_code == 404:
-                    raise HTTPException(
-                        status_code=404,
-                        detail=f"Currency pair {from_currency}/{to_currency} not found"
-                    )
-                
-                if response.status_code != 200:
-                    logger.error(f"ExchangeRate API error: {response.status_code}")
-                    raise HTTPException(
-                        status_code=response.status_code,
-                        detail="Exchange rate service unavailable"
-                    )
-                
-                data = response.json()
-                
-                # Check if API returned an error
-                if data.get("result") != "success":
-                    error_type = data.get("error-type", "unknown")
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Exchange rate API error: {error_type}"
-                    )
-                
-                return self._format_exchange_response(data, from_currency, to_currency, amount)
-                    
+            response = await http_client_manager.request(
+                "exchangerate", "GET", url,
+                timeout=settings.REQUEST_TIMEOUT
+            )
+
+            try:
+                data = fast_json.loads(response.content)
+            except ValueError:
+                data = {}
+
+            # Check if API returned an error
+            if response.status_code != 200 or data.get("result") != "success":
+                raise self._api_error(base_currency, response.status_code, data.get("error-type"))
+
+            # Rates only change when the provider publishes, so keep them until then
+            ttl = settings.EXCHANGE_RATE_CACHE_TTL
+            next_update = data.get("time_next_update_unix")
+            if next_update:
+                ttl = max(next_update - time.time(), 60)
+
+            await self._tables.set(base_currency, data, ttl=ttl)
+            return data
+
         except httpx.TimeoutException:
             logger.error("Timeout when calling ExchangeRate API")
             raise HTTPException(
@@ -62,7 +160,33 @@ class ExchangeRateService:
                 status_code=503,
                 detail="Exchange rate service unavailable"
             )
-    
+
+    def _api_error(self, base_currency: str, status_code: int, error_type: Optional[str]) -> HTTPException:
+        """Map an ExchangeRate failure to a status; only bad input gets one the negative cache keeps"""
+
+        if error_type == "unsupported-code" or (error_type is None and status_code == 404):
+            return HTTPException(
+                status_code=404,
+                detail=f"Currency {base_currency} not found"
+            )
+
+        if error_type == "malformed-request":
+            return HTTPException(
+                status_code=400,
+                detail=f"Exchange rate API error: {error_type}"
+            )
+
+        logger.error(f"ExchangeRate API error: {status_code} {error_type or ''}".rstrip())
+        return HTTPException(
+            status_code=ACCOUNT_ERRORS.get(error_type, status_code if status_code >= 500 else 502),
+            detail="Exchange rate service unavailable"
+        )
+
+    def cache_stats(self) -> dict:
+        """Rate table cache counters"""
+
+        return self._tables.stats()
+
     def _format_exchange_response(self, data: dict, from_currency: str, to_currency: str, amount: float) -> dict:
         """Format the exchange rate API response"""
         try:
@@ -89,4 +213,4 @@ class ExchangeRateService:
                 detail="Error processing exchange rate data"
             )
 
-exchange_rate_service = ExchangeRateService()
\ No newline at end of file
+exchange_rate_service = ExchangeRateService()
@@ -1,10 +1,31 @@
-from typing import Dict, Any
+import asyncio
+import re
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+from app.config import settings
+from app.services.admission import background
 from app.services.amadeus import amadeus_service
-from app.models import FlightSearchRequest
+from app.services.airports import airport_index
+from app.models import (
+    FlightSearchRequest, FlexibleFlightSearchRequest, BatchFlightSearchRequest,
+    FlightSegment, FlightOffer, FlightSearchResponse
+)
+from app.utils.cache_backend import create_cache
+import logging
+
+logger = logging.getLogger(__name__)
+
+_ISO_DURATION = re.compile(r"P(?:(\d+)D)?T(?:(\d+)H)?(?:(\d+)M)?")
 
 class FlightService:
     def __init__(self):
-        pass
+        self._cache = create_cache(
+            "flights",
+            maxsize=settings.FLIGHT_CACHE_MAX_ENTRIES,
+            ttl=settings.FLIGHT_CACHE_TTL,
+            stale_ttl=settings.FLIGHT_CACHE_STALE_TTL
+        )
+        self._refreshing: Dict[Tuple, asyncio.Task] = {}
 
     def validate_search_request(self, request: FlightSearchRequest) -> tuple[bool,str]:
         """Validate Flight Search Request"""
@@ -16,7 +37,6 @@ class FlightService:
             return False, "Airport codes must be at least 2 characters"
 
         try:
-            from datetime import datetime
             datetime.strptime(request.departure_date, "%Y-%m-%d")
             if request.return_date:
                 datetime.strptime(request.return_date, "%Y-%m-%d")
@@ -26,18 +46,31 @@ class FlightService:
         return True, ""
 
 
-    async def search_flights(self, request: FlightSearchRequest) -> Dict[str, Any]:
-        """Search Flights and return raw data"""
+    async def search_flights(self, request: FlightSearchRequest, raw: bool = False) -> Dict[str, Any]:
+        """Search Flights and return the ranked voice projection, or raw data if requested"""
 
         is_valid, error_msg = self.validate_search_request(request)
         if not is_valid:
             return {"error": f"I need valid flight information: {error_msg}"}
 
+        # Spoken place names ("Heathrow", "New York") become IATA codes locally
+        origin = airport_index.resolve(request.origin)
+        destination = airport_index.resolve(request.destination)
+        if not origin or not destination:
+            unknown = request.origin if not origin else request.destination
+            # Near matches are never searched unasked; the agent confirms one first
+            candidates = airport_index.search(unknown, limit=3)
+            if candidates:
+                options = " or ".join(f"{c['name']} ({c['code']})" for c in candidates)
+                return {"error": f"I'm not sure which airport you mean by '{unknown}'. Did you mean {options}?",
+                        "candidates": candidates}
+            return {"error": f"I couldn't find an airport matching '{unknown}'. Could you name the city or airport again?"}
+
         try:
             # Prepare search parameters
             search_params = {
-                "origin": request.origin.upper(),
-                "destination": request.destination.upper(),
+                "origin": origin,
+                "destination": destination,
                 "departure_date": request.departure_date,
                 "adults": request.adults
             }
@@ -45,8 +78,13 @@ class FlightService:
             if request.return_date:
                 search_params["return_date"] = request.return_date
 
-            flights_data = await amadeus_service.search_flights(search_params)
-            return flights_data
+            flights_data = await self._cached_search(search_params)
+            if raw:
+                return flights_data
+
+            return self.project_offers(
+                flights_data, search_params["origin"], search_params["destination"]
+            )
             
         except ValueError as e:
             return {"error": f"Invalid search parameters: {str(e)}"}
@@ -54,5 +92,296 @@ class FlightService:
             print(f"Flight search error: {e}")
             return {"error": "I'm having trouble searching for flights right now. Please try again."}
 
+    async def search_flexible_dates(self, request: FlexibleFlightSearchRequest) -> Dict[str, Any]:
+        """Search every departure date in a window concurrently and pick the cheapest"""
+
+        try:
+            start = datetime.strptime(request.departure_date_from, "%Y-%m-%d")
+            end = datetime.strptime(request.departure_date_to, "%Y-%m-%d")
+        except ValueError:
+            return {"error": "I need valid flight information: Invalid date format"}
+
+        days = (end - start).days + 1
+        if days < 1:
+            return {"error": "I need valid flight information: The date range is empty"}
+        if days > settings.FLEXIBLE_SEARCH_MAX_DAYS:
+            return {"error": f"I can search at most {settings.FLEXIBLE_SEARCH_MAX_DAYS} days at once"}
+
+        semaphore = asyncio.Semaphore(settings.FLIGHT_SEARCH_CONCURRENCY)
+
+        async def search_day(offset: int) -> Dict[str, Any]:
+            departure = start + timedelta(days=offset)
+            return_date = None
+            if request.return_offset_days is not None:
+                return_date = (departure + timedelta(days=request.return_offset_days)).strftime("%Y-%m-%d")
+
+            day_request = FlightSearchRequest(
+                origin=request.origin,
+                destination=request.destination,
+                departure_date=departure.strftime("%Y-%m-%d"),
+                return_date=return_date,
+                adults=request.adults
+            )
+
+            async with semaphore:
+                flights_data = await self.search_flights(day_request)
+
+            day = {
+                "departure_date": day_request.departure_date,
+                "return_date": return_date
+            }
+            if "error" in flights_data:
+                day["error"] = flights_data["error"]
+            else:
+                day["offers_found"] = flights_data["total_results"]
+                day["cheapest_offer"] = self._cheapest_offer(flights_data)
+            return day
+
+        results = await asyncio.gather(*(search_day(offset) for offset in range(days)))
+
+        priced = [day for day in results if day.get("cheapest_offer")]
+        best = min(priced, key=lambda day: self._offer_price(day["cheapest_offer"]), default=None)
+
+        return {
+            "origin": self._location_code(request.origin),
+            "destination": self._location_code(request.destination),
+            "days": results,
+            "best": best
+        }
+
+    def _expand_batch(self, request: BatchFlightSearchRequest) -> List[FlightSearchRequest]:
+        """Turn an explicit list and/or an origin x destination spec into legs"""
+
+        legs = list(request.searches or [])
+
+        if request.origins and request.destinations and request.departure_date:
+            for origin in request.origins:
+                for destination in request.destinations:
+                    legs.append(FlightSearchRequest(
+                        origin=origin,
+                        destination=destination,
+                        departure_date=request.departure_date,
+                        return_date=request.return_date,
+                        adults=request.adults
+                    ))
+
+        return legs
+
+    async def search_batch(self, request: BatchFlightSearchRequest) -> Dict[str, Any]:
+        """Run several searches concurrently and merge their offers into one ranking"""
+
+        legs = self._expand_batch(request)
+        if not legs:
+            return {"error": "I need at least one search, or origins, destinations and a departure date"}
+        if len(legs) > settings.FLIGHT_BATCH_MAX_LEGS:
+            return {"error": f"I can search at most {settings.FLIGHT_BATCH_MAX_LEGS} routes at once"}
+
+        semaphore = asyncio.Semaphore(settings.FLIGHT_SEARCH_CONCURRENCY)
+
+        async def search_leg(leg: FlightSearchRequest) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.search_flights(leg)
+
+        outcomes = await asyncio.gather(*(search_leg(leg) for leg in legs), return_exceptions=True)
+
+        results = []
+        ranking = []
+        for index, (leg, flights_data) in enumerate(zip(legs, outcomes)):
+            result = {
+                "leg": index,
+                "origin": self._location_code(leg.origin),
+                "destination": self._location_code(leg.destination),
+                "departure_date": leg.departure_date,
+                "return_date": leg.return_date
+            }
+
+            # A failed leg is reported on its own and never fails the batch
+            if isinstance(flights_data, Exception):
+                logger.error(f"Batch leg {index} failed: {flights_data}")
+                result["error"] = "I'm having trouble searching this route right now."
+            elif "error" in flights_data:
+                result["error"] = flights_data["error"]
+            else:
+                result["offers_found"] = flights_data["total_results"]
+                result["cheapest_offer"] = self._cheapest_offer(flights_data)
+                ranking.extend({"leg": index, "origin": result["origin"],
+                                "destination": result["destination"], "offer": offer}
+                               for offer in flights_data["flights"])
+
+            results.append(result)
+
+        ranking.sort(key=lambda entry: self._offer_price(entry["offer"]))
+
+        return {
+            "legs": results,
+            "ranking": ranking[:settings.VOICE_FLIGHT_RESULTS],
+            "failed_legs": sum(1 for result in results if "error" in result)
+        }
+
+    def _location_code(self, place: str) -> str:
+        """Resolved IATA code for display, falling back to the caller's input"""
+
+        return airport_index.resolve(place) or place.strip().upper()
+
+    def _offer_price(self, offer: Dict[str, Any]) -> float:
+        """Price of a projected flight offer"""
+
+        try:
+            return float(offer["price"])
+        except (KeyError, TypeError, ValueError):
+            return float("inf")
+
+    def _cheapest_offer(self, flights_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Cheapest offer in a projected search response (offers are already ranked)"""
+
+        flights = flights_data.get("flights") or []
+        return flights[0] if flights else None
+
+    def project_offers(self, flights_data: Dict[str, Any], origin: str, destination: str,
+                       limit: Optional[int] = None) -> Dict[str, Any]:
+        """Map raw Amadeus offers to compact FlightOffer models and keep the best few"""
+
+        carriers = (flights_data.get("dictionaries") or {}).get("carriers") or {}
+        raw_offers = flights_data.get("data") or []
+        limit = settings.VOICE_FLIGHT_RESULTS if limit is None else limit
+
+        # Rank on the raw payload so only the offers we return are built into models
+        offers = []
+        for raw_offer in sorted(raw_offers, key=self._rank_key):
+            if len(offers) >= limit:
+                break
+            try:
+                offers.append(self._project_offer(raw_offer, carriers))
+            except (KeyError, TypeError, ValueError, IndexError) as e:
+                logger.warning(f"Skipping malformed flight offer: {e}")
+
+        response = FlightSearchResponse(
+            flights=offers,
+            total_results=len(raw_offers),
+            origin=origin,
+            destination=destination
+        )
+        return response.model_dump()
+
+    def _rank_key(self, raw_offer: Dict[str, Any]) -> Tuple[float, int, int]:
+        """Sort raw offers by price, then total duration, then stops"""
+
+        try:
+            price = raw_offer["price"]
+            itineraries = raw_offer["itineraries"]
+            return (
+                float(price.get("grandTotal") or price["total"]),
+                sum(self._duration_minutes(it.get("duration", "")) for it in itineraries),
+                max(len(it["segments"]) - 1 for it in itineraries)
+            )
+        except (KeyError, TypeError, ValueError):
+            return (float("inf"), 0, 0)
+
+    def _project_offer(self, raw_offer: Dict[str, Any], carriers: Dict[str, str]) -> FlightOffer:
+        """Project a single Amadeus offer"""
+
+        segments = []
+        stops = 0
+        total_minutes = 0
+
+        for itinerary in raw_offer["itineraries"]:
+            itinerary_segments = itinerary["segments"]
+            stops = max(stops, len(itinerary_segments) - 1)
+            total_minutes += self._duration_minutes(itinerary.get("duration", ""))
+
+            for segment in itinerary_segments:
+                carrier = segment["carrierCode"]
+                segments.append(FlightSegment(
+                    departure_code=segment["departure"]["iataCode"],
+                    arrival_code=segment["arrival"]["iataCode"],
+                    departure_time=segment["departure"]["at"],
+                    arrival_time=segment["arrival"]["at"],
+                    airline_code=carrier,
+                    airline_name=carriers.get(carrier),
+                    flight_number=f"{carrier}{segment['number']}",
+                    duration=self._format_duration(segment.get("duration", ""))
+                ))
+
+        price = raw_offer["price"]
+        return FlightOffer(
+            price=price.get("grandTotal") or price["total"],
+            currency=price.get("currency", settings.DEFAULT_CURRENCY),
+            segments=segments,
+            stops=stops,
+            total_duration=self._format_minutes(total_minutes)
+        )
+
+    def _duration_minutes(self, duration: str) -> int:
+        """Minutes in an ISO 8601 duration (PT7H25M) or a formatted one (7h 25m)"""
+
+        match = _ISO_DURATION.fullmatch(duration or "")
+        if match:
+            days, hours, minutes = (int(group or 0) for group in match.groups())
+            return (days * 24 + hours) * 60 + minutes
+
+        hours = re.search(r"(\d+)h", duration or "")
+        minutes = re.search(r"(\d+)m", duration or "")
+        return int(hours.group(1) if hours else 0) * 60 + int(minutes.group(1) if minutes else 0)
+
+    def _format_duration(self, duration: str) -> str:
+        return self._format_minutes(self._duration_minutes(duration))
+
+    def _format_minutes(self, total_minutes: int) -> str:
+        """Voice friendly duration, e.g. 7h 25m"""
+
+        hours, minutes = divmod(total_minutes, 60)
+        return f"{hours}h {minutes}m" if minutes else f"{hours}h"
+
+    def _cache_key(self, search_params: Dict[str, Any]) -> Tuple:
+        """Build a cache key from the normalized search and result-shaping settings"""
+
+        return (
+            search_params["origin"],
+            search_params["destination"],
+            search_params["departure_date"],
+            search_params.get("return_date"),
+            search_params.get("adults") or 1,
+            settings.MAX_FLIGHT_RESULTS,
+            settings.DEFAULT_CURRENCY
+        )
+
+    async def _cached_search(self, search_params: Dict[str, Any]) -> Dict[str, Any]:
+        """Serve repeat searches from the cache, refreshing stale entries in the background"""
+
+        key = self._cache_key(search_params)
+        entry = await self._cache.get_entry(key)
+
+        if entry is not None:
+            flights_data, is_stale = entry
+            if is_stale:
+                self._schedule_refresh(key, search_params)
+            return flights_data
+
+        flights_data = await amadeus_service.search_flights(search_params)
+        await self._cache.set(key, flights_data)
+        return flights_data
+
+    def _schedule_refresh(self, key: Tuple, search_params: Dict[str, Any]):
+        """Start at most one background refresh per stale key"""
+
+        if key in self._refreshing:
+            return
+
+        async def refresh():
+            try:
+                with background():
+                    await self._cache.set(key, await amadeus_service.search_flights(search_params))
+            except Exception as e:
+                logger.warning(f"Background flight cache refresh failed: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Flight search cache counters"""
+
+        return {**self._cache.stats(), "refreshing": len(self._refreshing)}
+
 # Singleton instance
 flight_service = FlightService()
\ No newline at end of file
@@ -0,0 +1,164 @@
+import asyncio
+import httpx
+import time
+from contextvars import ContextVar
+from typing import Dict, Any, Optional
+from app.config import settings
+from app.services.admission import admission
+from app.services.resilience import resilience
+from app.utils.metrics import upstream_request_duration, upstream_requests_in_flight
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Upstream providers that get their own long-lived connection pool
+UPSTREAMS = ("amadeus", "openweather", "exchangerate", "timeapi", "opentripmap")
+
+# Per-request upstream call counts, set by the request logging middleware
+upstream_calls: ContextVar[Optional[Dict[str, int]]] = ContextVar("upstream_calls", default=None)
+
+
+class HTTPClientManager:
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _http2_available(self) -> bool:
+        """Check whether HTTP/2 can be enabled (requires the optional h2 package)"""
+
+        if not settings.HTTP2_ENABLED:
+            return False
+
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("HTTP2_ENABLED is set but the 'h2' package is not installed, using HTTP/1.1")
+            return False
+
+        return True
+
+    def _build_client(self, upstream: str) -> httpx.AsyncClient:
+        """Create a pooled client for a single upstream provider"""
+
+        limits = httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+        )
+
+        return httpx.AsyncClient(
+            limits=limits,
+            http2=self._http2_available(),
+            timeout=settings.REQUEST_TIMEOUT
+        )
+
+    async def startup(self):
+        """Open one client per upstream, called from the app lifespan"""
+
+        for upstream in UPSTREAMS:
+            self.get_client(upstream)
+
+        logger.info(f"HTTP client pools started for: {', '.join(UPSTREAMS)}")
+
+    async def shutdown(self):
+        """Close all clients, called from the app lifespan"""
+
+        clients = list(self._clients.values())
+        self._clients.clear()
+
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.error(f"Error closing HTTP client: {e}")
+
+        logger.info("HTTP client pools closed")
+
+    def get_client(self, upstream: str) -> httpx.AsyncClient:
+        """Get the shared client for an upstream, creating it on first use"""
+
+        client = self._clients.get(upstream)
+        if client is None or client.is_closed:
+            client = self._build_client(upstream)
+            self._clients[upstream] = client
+            self._stats.setdefault(upstream, {"requests": 0, "errors": 0, "in_flight": 0})
+
+        return client
+
+    async def request(self, upstream: str, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request through the shared pool, behind the upstream's circuit breaker.
+
+        Every attempt waits for an admission slot first. Its timeout is worked
+        out once admitted, so retries, hedges and queueing only get what is
+        left of the request's deadline.
+        """
+
+        requested = kwargs.pop("timeout", None)
+        return await resilience.execute(upstream, method, lambda: self._admitted_send(
+            upstream, method, url, requested, **kwargs
+        ))
+
+    async def _admitted_send(self, upstream: str, method: str, url: str,
+                             requested: Optional[float], **kwargs) -> httpx.Response:
+        async with admission.slot(upstream):
+            return await self._send(upstream, method, url, timeout=resilience.timeout_for(upstream, requested), **kwargs)
+
+    async def _send(self, upstream: str, method: str, url: str, **kwargs) -> httpx.Response:
+        """Single instrumented attempt against the upstream"""
+
+        client = self.get_client(upstream)
+        stats = self._stats[upstream]
+
+        stats["requests"] += 1
+        stats["in_flight"] += 1
+
+        calls = upstream_calls.get()
+        if calls is not None:
+            calls[upstream] = calls.get(upstream, 0) + 1
+
+        upstream_requests_in_flight.inc(upstream)
+        start = time.perf_counter()
+        status = "error"
+        try:
+            response = await client.request(method, url, **kwargs)
+            status = str(response.status_code)
+            return response
+        except httpx.TimeoutException:
+            stats["errors"] += 1
+            status = "timeout"
+            raise
+        except httpx.HTTPError:
+            stats["errors"] += 1
+            raise
+        except asyncio.CancelledError:
+            # Losing side of a hedged request
+            status = "cancelled"
+            raise
+        finally:
+            stats["in_flight"] -= 1
+            upstream_requests_in_flight.dec(upstream)
+            upstream_request_duration.observe(time.perf_counter() - start, upstream, status)
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Per-upstream request counters and connection pool usage"""
+
+        result = {}
+        for upstream, stats in self._stats.items():
+            client = self._clients.get(upstream)
+            pool = getattr(getattr(client, "_transport", None), "_pool", None)
+            connections = list(getattr(pool, "connections", []) or [])
+
+            result[upstream] = {
+                **stats,
+                "open": bool(client and not client.is_closed),
+                "connections": len(connections),
+                "idle_connections": sum(1 for c in connections if c.is_idle()),
+                "max_connections": settings.HTTP_MAX_CONNECTIONS,
+                "max_keepalive_connections": settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                "circuit": resilience.breaker(upstream).stats(),
+                "admission": admission.scheduler(upstream).stats()
+            }
+
+        return result
+
+http_client_manager = HTTPClientManager()
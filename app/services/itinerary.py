@@ -1,15 +1,36 @@
+import asyncio
 import httpx
+from typing import Dict, List
 from fastapi import HTTPException
 from app.config import settings
+from app.utils import fast_json
+from app.services.admission import background
+from app.services.http_client import http_client_manager
+from app.utils.cache_backend import create_cache
+from app.utils.coalesce import RequestCoalescer
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Stored in place of geoname data when OpenTripMap has no match
+NOT_FOUND = {"__not_found__": True}
+
 class ItineraryService:
     def __init__(self):
-        self.base_url = "https://api.opentripmap.com/0.1/en/places/geoname"
+        self.base_url = settings.OPENTRIPMAP_BASE_URL
+        self._coalescer = RequestCoalescer("opentripmap")
+        # Geonames are effectively static: always persisted, whatever CACHE_BACKEND says
+        self._cache = create_cache(
+            "geonames",
+            maxsize=settings.GEONAME_MEMORY_CACHE_SIZE,
+            ttl=settings.GEONAME_CACHE_TTL,
+            shared=True,
+            path=settings.GEONAME_CACHE_PATH,
+            local_ttl=settings.GEONAME_CACHE_TTL,
+            max_rows=settings.GEONAME_STORE_MAX_ROWS
+        )
         
-    async def get_itineraries(self, name: str) -> dict:
+    async def get_itineraries(self, name: str, include_raw: bool = False) -> dict:
         """Get itineraries for a given place from OpenTripMap API"""
         
         if not settings.OPENTRIPMAP_API_KEY:
@@ -18,30 +39,86 @@ class ItineraryService:
                 detail="OpenTripMap API key not configured"
             )
         
+        key = " ".join(name.lower().split())
+        data = await self._cache.get(key)
+        if data is None:
+            try:
+                data = await self._coalescer.run(key, lambda: self._fetch_geoname(key, name))
+            except httpx.TimeoutException:
+                # Our deadline passed while a shared call was still running
+                raise HTTPException(
+                    status_code=408,
+                    detail="Itinerary service timeout"
+                )
+
+        if data == NOT_FOUND:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Place '{name}' not found"
+            )
+
+        return self._format_itinerary_response(data, name, include_raw)
+
+    async def _set_cached(self, key: str, data: dict):
+        await self._cache.set(key, data, ttl=self._ttl_for(data))
+
+    def _ttl_for(self, data: dict) -> int:
+        return settings.GEONAME_NEGATIVE_TTL if data == NOT_FOUND else settings.GEONAME_CACHE_TTL
+
+    async def warm(self, names: List[str], concurrency: int = 5) -> Dict[str, str]:
+        """Preload geonames for a list of places, skipping ones already cached"""
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def warm_one(name: str) -> str:
+            async with semaphore:
+                try:
+                    with background():
+                        await self.get_itineraries(name)
+                    return "ok"
+                except HTTPException as e:
+                    return f"{e.status_code}: {e.detail}"
+
+        results = await asyncio.gather(*(warm_one(name) for name in names))
+        return dict(zip(names, results))
+
+    def cache_stats(self) -> dict:
+        """Memory tier counters plus persistent store hits"""
+
+        return self._cache.stats()
+    
+    async def _fetch_geoname(self, key: str, name: str) -> dict:
+        """Call OpenTripMap for the place details and cache the answer"""
+        
         params = {
             "name": name,
             "apikey": settings.OPENTRIPMAP_API_KEY
         }
         
         try:
-            async with httpx.AsyncClient(timeout=settings.REQUEST_TIMEOUT) as client:
-                response = await client.get(self.base_url, params=params)
-                
-                if response.status_code == 404:
-                    raise HTTPException(
-                        status_code=404,
-                        detail=f"Place '{name}' not found"
-                    )
-                
-                if response.status_code != 200:
-                    logger.error(f"OpenTripMap API error: {response.status_code}")
-                    raise HTTPException(
-                        status_code=response.status_code,
-                        detail="Itinerary service unavailable"
-                    )
-                
-                data = response.json()
-                return self._format_itinerary_response(data, name)
+            response = await http_client_manager.request(
+                "opentripmap", "GET", self.base_url,
+                params=params,
+                timeout=settings.REQUEST_TIMEOUT
+            )
+            
+            if response.status_code == 404:
+                await self._set_cached(key, NOT_FOUND)
+                return NOT_FOUND
+            
+            if response.status_code != 200:
+                logger.error(f"OpenTripMap API error: {response.status_code}")
+                raise HTTPException(
+                    status_code=response.status_code,
+                    detail="Itinerary service unavailable"
+                )
+            
+            data = fast_json.loads(response.content)
+            if data.get("status") == "NOT_FOUND":
+                data = NOT_FOUND
+
+            await self._set_cached(key, data)
+            return data
                     
         except httpx.TimeoutException:
             logger.error("Timeout when calling OpenTripMap API")
@@ -56,10 +133,10 @@ class ItineraryService:
                 detail="Itinerary service unavailable"
             )
     
-    def _format_itinerary_response(self, data: dict, original_name: str) -> dict:
+    def _format_itinerary_response(self, data: dict, original_name: str, include_raw: bool = False) -> dict:
         """Format the OpenTripMap API response"""
         try:
-            return {
+            result = {
                 "query": {
                     "original_name": original_name,
                     "status": "success"
@@ -73,9 +150,11 @@ class ItineraryService:
                         "lat": data.get("lat"),
                         "lon": data.get("lon")
                     }
-                },
-                "raw_data": data
+                }
             }
+            if include_raw:
+                result["raw_data"] = data
+            return result
         except Exception as e:
             logger.error(f"Error formatting itinerary response: {e}")
             raise HTTPException(
@@ -0,0 +1,245 @@
+import asyncio
+import random
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Deque, Dict, Optional
+import httpx
+from app.config import settings
+from app.services.admission import AdmissionRejected
+from app.utils import deadline
+from app.utils.metrics import circuit_state, upstream_hedges, upstream_retries
+import logging
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+RETRY_STATUSES = {429, 502, 503, 504}
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+_STATE_VALUES = {CLOSED: 0, OPEN: 1, HALF_OPEN: 2}
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised without calling the upstream while its circuit is open"""
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures, fails fast, then lets one probe through"""
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        circuit_state.set(name, value=0)
+
+    def _set_state(self, state: str):
+        if state != self.state:
+            logger.warning(f"Circuit for {self.name} is now {state}")
+        self.state = state
+        circuit_state.set(self.name, value=_STATE_VALUES[state])
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may go through"""
+
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                raise CircuitOpenError(f"{self.name} circuit is open")
+            self._set_state(HALF_OPEN)
+
+        if self.state == HALF_OPEN:
+            if self._probe_in_flight:
+                raise CircuitOpenError(f"{self.name} circuit is half-open, probe in flight")
+            self._probe_in_flight = True
+
+    def release(self):
+        """Give up a call slot without an outcome, e.g. when our own deadline cut it short"""
+
+        self._probe_in_flight = False
+
+    def record_success(self):
+        self.failures = 0
+        self._probe_in_flight = False
+        self._set_state(CLOSED)
+
+    def record_failure(self):
+        self.failures += 1
+        self._probe_in_flight = False
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            self._set_state(OPEN)
+
+    def stats(self) -> Dict[str, object]:
+        return {"state": self.state, "consecutive_failures": self.failures}
+
+
+class ResilienceLayer:
+    """Circuit breaking, hedging and jittered retries around upstream calls"""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latencies: Dict[str, Deque[float]] = {}
+
+    def breaker(self, upstream: str) -> CircuitBreaker:
+        breaker = self._breakers.get(upstream)
+        if breaker is None:
+            breaker = self._breakers[upstream] = CircuitBreaker(
+                upstream, settings.CIRCUIT_FAILURE_THRESHOLD, settings.CIRCUIT_RESET_TIMEOUT
+            )
+        return breaker
+
+    def timeout_for(self, upstream: str, requested: Optional[float]) -> httpx.Timeout:
+        """Per-provider read timeout, never looser than what the caller asked for or the deadline allows"""
+
+        read = settings.UPSTREAM_READ_TIMEOUTS.get(upstream, settings.REQUEST_TIMEOUT)
+        if requested is not None:
+            read = min(read, requested)
+        read = deadline.clamp(read)
+        return httpx.Timeout(read, connect=min(settings.UPSTREAM_CONNECT_TIMEOUT, read))
+
+    def hedge_threshold(self, upstream: str) -> Optional[float]:
+        """Observed latency percentile after which a second request is fired"""
+
+        samples = self._latencies.get(upstream)
+        if not settings.HEDGE_ENABLED or not samples or len(samples) < settings.HEDGE_MIN_SAMPLES:
+            return None
+
+        ordered = sorted(samples)
+        return ordered[min(int(len(ordered) * settings.HEDGE_PERCENTILE), len(ordered) - 1)]
+
+    async def execute(self, upstream: str, method: str,
+                      send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """Run send() under the upstream's breaker, with hedging and retries for idempotent calls"""
+
+        breaker = self.breaker(upstream)
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        attempt = 0
+
+        while True:
+            # Shed before taking a breaker slot, so a half-open probe is never wasted
+            if deadline.expired():
+                raise deadline.exceeded(upstream)
+            breaker.before_call()
+
+            try:
+                if idempotent:
+                    response = await self._hedged(upstream, send)
+                else:
+                    response = await self._timed(upstream, send)
+            except AdmissionRejected:
+                # Refused on our side before reaching the upstream
+                breaker.release()
+                raise
+            except httpx.TransportError as e:
+                if deadline.expired():
+                    # The timeout was ours, not a sign the upstream is unhealthy
+                    breaker.release()
+                    raise deadline.exceeded(upstream) from e
+                breaker.record_failure()
+                delay = self._backoff(attempt + 1)
+                if not self._may_retry(breaker, idempotent, attempt, delay):
+                    raise
+                attempt += 1
+                upstream_retries.inc(upstream, type(e).__name__)
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # Cancelled (barge-in, shutdown) or failed on our side: no outcome to
+                # record, but a half-open probe must not stay in flight forever
+                breaker.release()
+                raise
+
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+            if response.status_code in RETRY_STATUSES:
+                delay = self._retry_after(response) or self._backoff(attempt + 1)
+                if self._may_retry(breaker, idempotent, attempt, delay):
+                    attempt += 1
+                    upstream_retries.inc(upstream, str(response.status_code))
+                    await asyncio.sleep(delay)
+                    continue
+
+            return response
+
+    def _may_retry(self, breaker: CircuitBreaker, idempotent: bool, attempt: int, delay: float) -> bool:
+        # Retries stop as soon as the breaker trips so they never pile onto a failing upstream,
+        # and are skipped when the wait alone would use up the request's deadline
+        return (idempotent and attempt < settings.UPSTREAM_MAX_RETRIES and breaker.state == CLOSED
+                and deadline.allows(delay))
+
+    async def _timed(self, upstream: str, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        start = time.perf_counter()
+        response = await send()
+
+        samples = self._latencies.get(upstream)
+        if samples is None:
+            samples = self._latencies[upstream] = deque(maxlen=settings.HEDGE_WINDOW)
+        samples.append(time.perf_counter() - start)
+
+        return response
+
+    async def _hedged(self, upstream: str, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """Fire a backup request if the first one is slower than the hedge threshold"""
+
+        threshold = self.hedge_threshold(upstream)
+        if threshold is None:
+            return await self._timed(upstream, send)
+
+        first = asyncio.ensure_future(self._timed(upstream, send))
+        done, _ = await asyncio.wait({first}, timeout=threshold)
+        if done:
+            return first.result()
+
+        upstream_hedges.inc(upstream)
+        second = asyncio.ensure_future(self._timed(upstream, send))
+        pending = {first, second}
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if not task.exception():
+                        return task.result()
+
+            # Both attempts failed: surface the first one's error
+            return first.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff"""
+
+        return random.uniform(0, settings.UPSTREAM_RETRY_BACKOFF * (2 ** (attempt - 1)))
+
+    def _retry_after(self, response: httpx.Response) -> Optional[float]:
+        """Seconds to wait from a Retry-After header (delta or HTTP date), capped"""
+
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+
+        return min(max(delay, 0.0), settings.UPSTREAM_RETRY_AFTER_MAX)
+
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        return {
+            upstream: {**breaker.stats(), "hedge_threshold": self.hedge_threshold(upstream)}
+            for upstream, breaker in self._breakers.items()
+        }
+
+resilience = ResilienceLayer()
@@ -0,0 +1,302 @@
+import asyncio
+import re
+from datetime import date, datetime, timedelta
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+from fastapi import HTTPException
+from app.config import settings
+from app.models import FlightSearchRequest
+from app.services.exchange import exchange_rate_service
+from app.services.flight import flight_service
+from app.services.time import time_service
+from app.services.weather import weather_service
+from app.utils import deadline
+from app.utils.deadline import Deadline
+import logging
+
+logger = logging.getLogger(__name__)
+
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+MONTHS = ("january", "february", "march", "april", "may", "june", "july", "august", "september",
+          "october", "november", "december", "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep",
+          "sept", "oct", "nov", "dec")
+# The date phrases parse_spoken_date understands, so they never end up in a place name
+DATE_PHRASE = (
+    rf"(?:today|tomorrow|(?:next |this )?(?:{'|'.join(WEEKDAYS)})|\d{{4}}-\d{{2}}-\d{{2}}"
+    rf"|(?:{'|'.join(MONTHS)}) \d{{1,2}}(?:st|nd|rd|th)?|\d{{1,2}}(?:st|nd|rd|th)? (?:of )?(?:{'|'.join(MONTHS)}))\b"
+)
+FLIGHT_PATTERN = re.compile(
+    rf"\bfrom (?P<origin>[a-z .'-]+?) to (?P<destination>[a-z .'-]+?)"
+    rf"(?= on | for | departing | leaving | {DATE_PHRASE}|[?.!,]|$)"
+)
+WEATHER_PATTERN = re.compile(r"\bweather (?:like )?(?:in|for|at) (?P<place>[a-z .,'-]+?)(?: today| now| right now)?[?.!]*$")
+TIME_PATTERN = re.compile(r"\btime (?:is it )?(?:in|at) (?P<place>[a-z .,'/_-]+?)(?: right now| now)?[?.!]*$")
+CURRENCY_PATTERN = re.compile(r"(?P<amount>\d+(?:\.\d+)?) (?P<from>[a-z]{3}) (?:to|in|into) (?P<to>[a-z]{3})\b")
+ISO_DATE_PATTERN = re.compile(r"\b(\d{4}-\d{2}-\d{2})\b")
+MONTH_DAY_PATTERN = re.compile(
+    r"\b(?:(?P<month1>[a-z]{3,9}) (?P<day1>\d{1,2})(?:st|nd|rd|th)?|(?P<day2>\d{1,2})(?:st|nd|rd|th)? (?:of )?(?P<month2>[a-z]{3,9}))\b"
+)
+# Served by app.routers.retell; also the prefix the per-turn deadline is looked up under
+LLM_WEBSOCKET_PATH = "/api/retell/llm-websocket"
+
+REMINDER = "Are you still there? I can look up flights, weather, local time or exchange rates."
+FALLBACK = ("I can help with flights, weather, local time and currency conversion. "
+            "For example, ask for flights from Boston to London on June 3rd.")
+
+
+def parse_spoken_date(text: str, today: Optional[date] = None) -> Optional[str]:
+    """YYYY-MM-DD for a spoken date like 'tomorrow', 'friday' or 'june 3rd'"""
+
+    today = today or date.today()
+    text = text.lower()
+
+    match = ISO_DATE_PATTERN.search(text)
+    if match:
+        return match.group(1)
+
+    if "today" in text:
+        return today.isoformat()
+    if "tomorrow" in text:
+        return (today + timedelta(days=1)).isoformat()
+
+    for match in MONTH_DAY_PATTERN.finditer(text):
+        month = match.group("month1") or match.group("month2")
+        day = int(match.group("day1") or match.group("day2"))
+        for fmt in ("%B", "%b"):
+            try:
+                month_number = datetime.strptime(month, fmt).month
+                break
+            except ValueError:
+                continue
+        else:
+            continue
+
+        try:
+            candidate = date(today.year, month_number, day)
+        except ValueError:
+            continue
+        # Dates already behind us mean next year
+        if candidate < today:
+            candidate = candidate.replace(year=today.year + 1)
+        return candidate.isoformat()
+
+    for index, weekday in enumerate(WEEKDAYS):
+        if re.search(rf"\b{weekday}\b", text):
+            return (today + timedelta(days=(index - today.weekday()) % 7 or 7)).isoformat()
+
+    return None
+
+
+class RetellLLMService:
+    """Turns a Retell transcript into streamed spoken replies using the local services"""
+
+    def user_utterances(self, transcript: List[Dict[str, Any]]) -> List[str]:
+        return [turn.get("content", "").strip() for turn in transcript or [] if turn.get("role") == "user"]
+
+    async def compose(self, event: Dict[str, Any]) -> AsyncIterator[str]:
+        """Yield reply chunks; quick acknowledgements come before slow upstream calls"""
+
+        if event.get("interaction_type") == "reminder_required":
+            yield REMINDER
+            return
+
+        utterances = self.user_utterances(event.get("transcript"))
+        if not utterances:
+            yield settings.RETELL_LLM_GREETING
+            return
+
+        text = utterances[-1].lower()
+
+        match = CURRENCY_PATTERN.search(text)
+        if match:
+            yield await self._convert(float(match.group("amount")), match.group("from"), match.group("to"))
+            return
+
+        match = WEATHER_PATTERN.search(text)
+        if match:
+            place = match.group("place").strip(" ,")
+            yield f"Let me check the weather in {place}."
+            yield await self._weather(place)
+            return
+
+        match = TIME_PATTERN.search(text)
+        if match:
+            yield await self._time(match.group("place").strip(" ,"))
+            return
+
+        async for chunk in self._flights(utterances):
+            yield chunk
+
+    async def _flights(self, utterances: List[str]) -> AsyncIterator[str]:
+        # Slots can arrive over several turns: "flights from Boston to Paris" ... "on Friday"
+        route = None
+        departure_date = None
+        for utterance in reversed(utterances[-settings.RETELL_LLM_SLOT_TURNS:]):
+            lowered = utterance.lower()
+            departure_date = departure_date or parse_spoken_date(lowered)
+            route = FLIGHT_PATTERN.search(lowered)
+            if route:
+                break
+
+        if not route:
+            yield FALLBACK
+            return
+
+        origin = route.group("origin").strip()
+        destination = route.group("destination").strip()
+        if not departure_date:
+            yield f"Sure, flights from {origin.title()} to {destination.title()}. What date would you like to leave?"
+            return
+
+        yield f"Let me check flights from {origin.title()} to {destination.title()} on {self._spoken_date(departure_date)}."
+
+        result = await flight_service.search_flights(FlightSearchRequest(
+            origin=origin, destination=destination, departure_date=departure_date
+        ))
+        if "error" in result:
+            yield result["error"]
+            return
+
+        flights = result.get("flights") or []
+        if not flights:
+            yield "I couldn't find any flights for that date. Would you like to try another day?"
+            return
+
+        best = flights[0]
+        first = best["segments"][0]
+        stops = "nonstop" if best["stops"] == 0 else f"with {best['stops']} stop{'s' if best['stops'] > 1 else ''}"
+        yield (f"The best option is {best['price']} {best['currency']} on "
+               f"{first.get('airline_name') or first['airline_code']}, {stops}, "
+               f"{best['total_duration']}, departing at {first['departure_time'][11:16]}.")
+
+        if len(flights) > 1:
+            yield f"I found {result['total_results']} options in total. Would you like to hear more?"
+
+    async def _weather(self, place: str) -> str:
+        try:
+            data = await weather_service.get_current_weather(place)
+        except HTTPException as e:
+            return f"Sorry, I couldn't get the weather for {place}: {e.detail}."
+
+        weather = data["weather"]
+        temperature = weather["temperature"]["current"]
+        return (f"In {data['location']['name']} it's {weather['description']} and "
+                f"{round(temperature)} degrees Celsius.")
+
+    async def _time(self, place: str) -> str:
+        try:
+            data = await time_service.get_current_time(place)
+        except HTTPException:
+            return f"Sorry, I don't know the time zone for {place}."
+
+        info = data["time_info"]
+        return f"It's {info['time']} on {info['day_of_week']} in {place.title()}."
+
+    async def _convert(self, amount: float, from_currency: str, to_currency: str) -> str:
+        try:
+            data = await exchange_rate_service.convert_currency(from_currency, to_currency, amount)
+        except HTTPException as e:
+            return f"Sorry, I couldn't convert that: {e.detail}."
+
+        conversion = data["conversion"]
+        return (f"{amount:g} {conversion['from_currency']} is about "
+                f"{conversion['converted_amount']:.2f} {conversion['to_currency']}.")
+
+    def _spoken_date(self, value: str) -> str:
+        day = datetime.strptime(value, "%Y-%m-%d")
+        return f"{day.strftime('%A, %B')} {day.day}"
+
+
+class RetellLLMSession:
+    """One Retell custom LLM WebSocket connection.
+
+    Each response_required event starts a streaming task; a newer
+    response_id cancels the previous one so barge-ins never hear stale answers.
+    """
+
+    def __init__(self, call_id: str, send: Callable[[Dict[str, Any]], Awaitable[None]]):
+        self.call_id = call_id
+        self._send = send
+        self._send_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._response_id: Optional[int] = None
+
+    async def start(self):
+        """Send the connection config and the opening greeting"""
+
+        await self.send({
+            "response_type": "config",
+            "config": {"auto_reconnect": True, "call_details": False}
+        })
+        await self._send_response(0, settings.RETELL_LLM_GREETING, complete=True)
+
+    async def send(self, message: Dict[str, Any]):
+        async with self._send_lock:
+            await self._send(message)
+
+    async def handle(self, event: Dict[str, Any]):
+        """Dispatch one event received from Retell"""
+
+        interaction_type = event.get("interaction_type")
+
+        if interaction_type == "ping_pong":
+            await self.send({"response_type": "ping_pong", "timestamp": event.get("timestamp")})
+
+        elif interaction_type in ("response_required", "reminder_required"):
+            response_id = event.get("response_id")
+            self._cancel_current()
+            self._response_id = response_id
+            self._task = asyncio.create_task(self._respond(response_id, event))
+
+        elif interaction_type == "call_details":
+            logger.info(f"Retell call {self.call_id} started")
+
+        # update_only carries transcript updates we don't act on
+
+    async def _respond(self, response_id: int, event: Dict[str, Any]):
+        # Each turn gets its own deadline, like an HTTP request to the same path
+        current = Deadline(deadline.budget_for(LLM_WEBSOCKET_PATH))
+        token = deadline.start(current)
+        try:
+            async for chunk in retell_llm_service.compose(event):
+                await self._send_response(response_id, chunk, complete=False)
+            await self._send_response(response_id, "", complete=True)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Retell response {response_id} failed for call {self.call_id}: {e}")
+            await self._send_response(
+                response_id, "Sorry, something went wrong on my side. Could you say that again?", complete=True
+            )
+        finally:
+            deadline.reset(token)
+            stage = current.missed or ("response" if current.expired() else None)
+            if stage:
+                deadline.record_miss(f"{LLM_WEBSOCKET_PATH}/{{call_id}}", stage)
+
+    async def _send_response(self, response_id: int, content: str, complete: bool):
+        # A superseded task may still be between awaits; drop its output
+        if response_id != 0 and response_id != self._response_id:
+            return
+
+        await self.send({
+            "response_type": "response",
+            "response_id": response_id,
+            "content": content,
+            "content_complete": complete,
+            "end_call": False
+        })
+
+    def _cancel_current(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    async def close(self):
+        """Cancel in-flight work when the call ends"""
+
+        task = self._task
+        self._cancel_current()
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+
+retell_llm_service = RetellLLMService()
@@ -1,45 +1,173 @@
 import httpx
+from datetime import datetime
+from typing import Dict, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError, available_timezones
 from fastapi import HTTPException
 from app.config import settings
+from app.utils import fast_json
+from app.services.http_client import http_client_manager
+from app.utils.negative_cache import negative_cache
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Common spoken abbreviations mapped to a representative tz database zone
+TIMEZONE_ALIASES = {
+    "utc": "UTC",
+    "gmt": "Etc/GMT",
+    "z": "UTC",
+    "est": "America/New_York",
+    "edt": "America/New_York",
+    "eastern": "America/New_York",
+    "cst": "America/Chicago",
+    "cdt": "America/Chicago",
+    "central": "America/Chicago",
+    "mst": "America/Denver",
+    "mdt": "America/Denver",
+    "mountain": "America/Denver",
+    "pst": "America/Los_Angeles",
+    "pdt": "America/Los_Angeles",
+    "pacific": "America/Los_Angeles",
+    "bst": "Europe/London",
+    "cet": "Europe/Paris",
+    "cest": "Europe/Paris",
+    "ist": "Asia/Kolkata",
+    "jst": "Asia/Tokyo",
+    "aest": "Australia/Sydney",
+    "sgt": "Asia/Singapore"
+}
+
 class TimeService:
     def __init__(self):
-        self.base_url = "https://timeapi.io/api/Time/current/zone"
-        
-    async def get_current_time(self, timezone: str) -> dict:
-        """Get current time for a timezone using TimeAPI"""
+        self.base_url = settings.TIMEAPI_BASE_URL
+        self._zones: Dict[str, ZoneInfo] = {}
+        self._zone_names: Optional[Dict[str, str]] = None
+
+    def _build_zone_index(self) -> Dict[str, str]:
+        """Map lowercase names, space spellings and unique city names to zone keys"""
+
+        index: Dict[str, str] = {}
+        cities: Dict[str, Optional[str]] = {}
+
+        for name in available_timezones():
+            lower = name.lower()
+            index[lower] = name
+            index[lower.replace("_", " ")] = name
+
+            city = lower.rsplit("/", 1)[-1].replace("_", " ")
+            if "/" in name and not lower.startswith("etc/"):
+                cities[city] = None if city in cities and cities[city] != name else name
+
+        for city, name in cities.items():
+            if name:
+                index.setdefault(city, name)
+
+        # Spoken abbreviations win over the fixed-offset legacy zones (EST, MST)
+        index.update(TIMEZONE_ALIASES)
+
+        return index
+
+    def resolve_timezone(self, timezone: str) -> Optional[str]:
+        """Canonical tz database name for a zone, alias or city, or None"""
+
+        if self._zone_names is None:
+            self._zone_names = self._build_zone_index()
+
+        return self._zone_names.get(" ".join(timezone.strip().lower().split()))
+
+    def _get_zone(self, name: str) -> ZoneInfo:
+        zone = self._zones.get(name)
+        if zone is None:
+            zone = self._zones[name] = ZoneInfo(name)
+        return zone
+
+    async def get_current_time(self, timezone: str, include_raw: bool = False) -> dict:
+        """Get current time for a timezone from the local tz database"""
+
+        if settings.TIME_SERVICE_MODE == "remote":
+            return await self._get_remote_time(timezone, include_raw)
+
+        zone_name = self.resolve_timezone(timezone)
+        if zone_name is None:
+            if settings.TIME_REMOTE_FALLBACK:
+                return await self._get_remote_time(timezone, include_raw)
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid timezone format: '{timezone}'"
+            )
+
+        try:
+            zone = self._get_zone(zone_name)
+        except ZoneInfoNotFoundError:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid timezone format: '{timezone}'"
+            )
+
+        now = datetime.now(zone)
+        data = {
+            "year": now.year,
+            "month": now.month,
+            "day": now.day,
+            "hour": now.hour,
+            "minute": now.minute,
+            "seconds": now.second,
+            "milliSeconds": now.microsecond // 1000,
+            "dateTime": now.replace(tzinfo=None).isoformat(),
+            "date": now.strftime("%m/%d/%Y"),
+            "time": now.strftime("%H:%M"),
+            "timeZone": zone_name,
+            "dayOfWeek": now.strftime("%A"),
+            "dayOfYear": now.timetuple().tm_yday,
+            "weekOfYear": now.isocalendar()[1],
+            "dstActive": bool(now.dst())
+        }
+        return self._format_time_response(data, timezone, include_raw)
+
+    async def _get_remote_time(self, timezone: str, include_raw: bool = False) -> dict:
+        """Get current time for a timezone using TimeAPI, remembering zones it rejects"""
+
+        key = " ".join(timezone.strip().lower().split())
+        await negative_cache.check("timeapi", key)
+        try:
+            return await self._fetch_remote_time(timezone, include_raw)
+        except HTTPException as e:
+            await negative_cache.remember("timeapi", key, e.status_code, e.detail)
+            raise
+
+    async def _fetch_remote_time(self, timezone: str, include_raw: bool = False) -> dict:
+        """Call TimeAPI for the current time in a timezone"""
         
         # Build URL with timezone parameter
         url = f"{self.base_url}?timeZone={timezone}"
         
         try:
-            async with httpx.AsyncClient(timeout=settings.REQUEST_TIMEOUT) as client:
-                response = await client.get(url)
-                
-                if response.status_code == 404:
-                    raise HTTPException(
-                        status_code=404,
-                        detail=f"Timezone '{timezone}' not found"
-                    )
-                
-                if response.status_code == 400:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Invalid timezone format: '{timezone}'"
-                    )
-                
-                if response.status_code != 200:
-                    logger.error(f"TimeAPI error: {response.status_code}")
-                    raise HTTPException(
-                        status_code=response.status_code,
-                        detail="Time service unavailable"
-                    )
-                
-                data = response.json()
-                return self._format_time_response(data, timezone)
+            response = await http_client_manager.request(
+                "timeapi", "GET", url,
+                timeout=settings.REQUEST_TIMEOUT
+            )
+            
+            if response.status_code == 404:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Timezone '{timezone}' not found"
+                )
+            
+            if response.status_code == 400:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Invalid timezone format: '{timezone}'"
+                )
+            
+            if response.status_code != 200:
+                logger.error(f"TimeAPI error: {response.status_code}")
+                raise HTTPException(
+                    status_code=response.status_code,
+                    detail="Time service unavailable"
+                )
+            
+            data = fast_json.loads(response.content)
+            return self._format_time_response(data, timezone, include_raw)
                     
         except httpx.TimeoutException:
             logger.error("Timeout when calling TimeAPI")
@@ -54,10 +182,10 @@ class TimeService:
                 detail="Time service unavailable"
             )
     
-    def _format_time_response(self, data: dict, requested_timezone: str) -> dict:
+    def _format_time_response(self, data: dict, requested_timezone: str, include_raw: bool = False) -> dict:
         """Format the time API response"""
         try:
-            return {
+            result = {
                 "time_info": {
                     "requested_timezone": requested_timezone,
                     "current_time": data.get("dateTime"),
@@ -67,9 +195,12 @@ class TimeService:
                     "day_of_week": data.get("dayOfWeek"),
                     "day_of_year": data.get("dayOfYear"),
                     "week_of_year": data.get("weekOfYear")
-                },
-                "raw_data": data
+                }
             }
+            # The upstream payload doubles the response size, so only echo it on request
+            if include_raw:
+                result["raw_data"] = data
+            return result
         except Exception as e:
             logger.error(f"Error formatting time response: {e}")
             raise HTTPException(
@@ -0,0 +1,123 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Dict, Optional, Set
+from fastapi import HTTPException
+from app.config import settings
+from app.services.exchange import exchange_rate_service
+from app.services.itinerary import itinerary_service
+from app.services.time import time_service
+from app.services.weather import weather_service
+from app.utils import deadline
+from app.utils.metrics import trip_brief_sections
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TripBriefService:
+    """Weather, local time, currency and place info for a destination in one call.
+
+    Sections run concurrently under one latency budget. Whatever is done at
+    the deadline is returned; the rest is reported as pending and keeps
+    running in the background so its result is cached for the next turn.
+    """
+
+    def __init__(self):
+        self._background: Set[asyncio.Task] = set()
+
+    async def get_brief(self, destination: str, timezone: Optional[str] = None,
+                        from_currency: Optional[str] = None, to_currency: Optional[str] = None,
+                        amount: float = 1.0, budget_ms: Optional[int] = None) -> dict:
+        """Run every section concurrently and return what finished within the budget"""
+
+        budget_ms = min(budget_ms or settings.TRIP_BRIEF_BUDGET_MS, settings.TRIP_BRIEF_MAX_BUDGET_MS)
+        left = deadline.remaining()
+        if left is not None:
+            # Answer before the request's own deadline, keeping time back to send the brief
+            budget_ms = max(0, min(budget_ms, int(left * 1000) - settings.DEADLINE_RESERVE_MS))
+        start = time.perf_counter()
+
+        place = asyncio.ensure_future(itinerary_service.get_itineraries(destination))
+        tasks: Dict[str, asyncio.Future] = {
+            "weather": asyncio.ensure_future(weather_service.get_current_weather(destination)),
+            "time": asyncio.ensure_future(self._local_time(destination, timezone, place)),
+            "place": place
+        }
+        if from_currency and to_currency:
+            tasks["exchange"] = asyncio.ensure_future(
+                exchange_rate_service.convert_currency(from_currency, to_currency, amount)
+            )
+
+        try:
+            await asyncio.wait(tasks.values(), timeout=budget_ms / 1000)
+        finally:
+            # Also when the caller hung up: late sections still warm the caches
+            for task in tasks.values():
+                if not task.done():
+                    self._finish_in_background(task)
+
+        sections = {name: self._section(name, task) for name, task in tasks.items()}
+        if "exchange" not in tasks:
+            sections["exchange"] = {"status": "skipped", "error": "Provide 'from' and 'to' currencies"}
+
+        return {
+            "query": {
+                "destination": destination,
+                "budget_ms": budget_ms
+            },
+            "complete": all(task.done() for task in tasks.values()),
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+            "sections": sections
+        }
+
+    async def _local_time(self, destination: str, timezone: Optional[str], place: Awaitable[dict]) -> dict:
+        """Local time for the explicit timezone, the destination name, or the place's timezone"""
+
+        zone = timezone or time_service.resolve_timezone(destination)
+        if zone is None:
+            # Not a zone or unique city name: wait for the geoname, which carries one
+            zone = (await place).get("place_info", {}).get("timezone")
+            if not zone:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Timezone for '{destination}' not found"
+                )
+
+        return await time_service.get_current_time(zone)
+
+    def _section(self, name: str, task: asyncio.Future) -> Dict[str, Any]:
+        if not task.done():
+            section = {"status": "pending"}
+        elif isinstance(task.exception(), HTTPException):
+            error = task.exception()
+            section = {"status": "failed", "error": error.detail, "status_code": error.status_code}
+        elif task.exception() is not None:
+            logger.error(f"Trip brief {name} section failed: {task.exception()}")
+            section = {"status": "failed", "error": f"{name.capitalize()} service unavailable", "status_code": 500}
+        else:
+            section = {"status": "ok", "data": task.result()}
+
+        trip_brief_sections.inc(name, section["status"])
+        return section
+
+    def _finish_in_background(self, task: asyncio.Future):
+        """Keep a reference until the late section finishes and retrieve its exception"""
+
+        self._background.add(task)
+
+        def done(finished: asyncio.Future):
+            self._background.discard(finished)
+            if not finished.cancelled():
+                finished.exception()
+
+        task.add_done_callback(done)
+
+    async def shutdown(self):
+        """Cancel sections still running after their brief was returned"""
+
+        for task in list(self._background):
+            task.cancel()
+        await asyncio.gather(*self._background, return_exceptions=True)
+
+
+trip_brief_service = TripBriefService()
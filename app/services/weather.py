@@ -1,14 +1,66 @@
+import asyncio
 import httpx
+from typing import List, Optional
 from fastapi import HTTPException
 from app.config import settings
+from app.utils import fast_json
+from app.services.http_client import http_client_manager
+from app.utils.cache_backend import create_cache
+from app.utils.coalesce import RequestCoalescer
+from app.utils.negative_cache import negative_cache
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Country spellings callers use that OpenWeather knows by ISO code
+COUNTRY_ALIASES = {
+    "uk": "gb",
+    "england": "gb",
+    "great britain": "gb",
+    "united kingdom": "gb",
+    "usa": "us",
+    "united states": "us",
+    "america": "us"
+}
+
 class WeatherService:
     def __init__(self):
-        self.base_url = "https://api.openweathermap.org/data/2.5/weather"
-        
+        self.base_url = settings.OPENWEATHER_BASE_URL
+        self._coalescer = RequestCoalescer("openweather")
+        # Weather per resolved place (city ID or rounded coordinates)
+        self._cache = create_cache(
+            "weather",
+            maxsize=settings.WEATHER_CACHE_MAX_ENTRIES,
+            ttl=settings.WEATHER_CACHE_TTL
+        )
+        # Normalized query spellings -> resolved place key
+        self._places = create_cache(
+            "weather_places",
+            maxsize=settings.WEATHER_CACHE_MAX_ENTRIES * 4,
+            ttl=settings.WEATHER_PLACE_CACHE_TTL
+        )
+
+    def normalize_location(self, q: str) -> str:
+        """Canonical query string: lowercase, trimmed parts, ISO country codes"""
+
+        parts = [" ".join(part.lower().split()) for part in q.split(",")]
+        parts = [part for part in parts if part]
+        if len(parts) > 1:
+            parts[-1] = COUNTRY_ALIASES.get(parts[-1], parts[-1])
+        return ",".join(parts)
+
+    def _place_key(self, data: dict) -> Optional[str]:
+        """Key shared by every spelling that resolves to the same place"""
+
+        if data.get("id"):
+            return f"id:{data['id']}"
+
+        coord = data.get("coord") or {}
+        if coord.get("lat") is not None and coord.get("lon") is not None:
+            return f"coord:{round(coord['lat'], 2)},{round(coord['lon'], 2)}"
+
+        return None
+
     async def get_current_weather(self, q: str) -> dict:
         """Get current weather for a location"""
         
@@ -18,6 +70,73 @@ class WeatherService:
                 detail="OpenWeather API key not configured"
             )
         
+        location = self.normalize_location(q)
+        place_key = await self._places.get(location)
+        if place_key is not None:
+            weather = await self._cache.get(place_key)
+            if weather is not None:
+                return weather
+
+        await negative_cache.check("weather", location)
+        try:
+            data = await self._coalescer.run(location, lambda: self._fetch_current_weather(q))
+        except HTTPException as e:
+            await negative_cache.remember("weather", location, e.status_code, e.detail)
+            raise
+        except httpx.TimeoutException:
+            # Our deadline passed while a shared call was still running
+            raise HTTPException(
+                status_code=408,
+                detail="Weather service timeout"
+            )
+        weather = self._format_weather_response(data)
+
+        place_key = self._place_key(data)
+        if place_key is not None:
+            await self._cache.set(place_key, weather)
+
+            # Remember this spelling plus "name,country". Never the bare name: "London, CA"
+            # must not answer a later "London"
+            await self._places.set(location, place_key)
+            if data.get("name") and data.get("sys", {}).get("country"):
+                canonical = f"{data['name']},{data['sys']['country']}"
+                await self._places.set(self.normalize_location(canonical), place_key)
+
+        return weather
+
+    async def get_weather_batch(self, locations: List[str]) -> dict:
+        """Current weather for several locations, fetched concurrently"""
+
+        if len(locations) > settings.WEATHER_BATCH_MAX_LOCATIONS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {settings.WEATHER_BATCH_MAX_LOCATIONS} locations per request"
+            )
+
+        outcomes = await asyncio.gather(
+            *(self.get_current_weather(q) for q in locations), return_exceptions=True
+        )
+
+        results = []
+        for q, outcome in zip(locations, outcomes):
+            if isinstance(outcome, HTTPException):
+                results.append({"query": q, "error": outcome.detail, "status_code": outcome.status_code})
+            elif isinstance(outcome, Exception):
+                logger.error(f"Weather batch lookup failed for '{q}': {outcome}")
+                results.append({"query": q, "error": "Weather service unavailable", "status_code": 500})
+            else:
+                results.append({"query": q, **outcome})
+
+        return {"results": results}
+
+    def cache_stats(self) -> dict:
+        """Weather and place-alias cache counters"""
+
+        return {"weather": self._cache.stats(), "places": self._places.stats()}
+    
+    async def _fetch_current_weather(self, q: str) -> dict:
+        """Call OpenWeather for the current weather"""
+        
         params = {
             "q": q,
             "appid": settings.OPENWEATHER_API_KEY,
@@ -25,24 +144,26 @@ class WeatherService:
         }
         
         try:
-            async with httpx.AsyncClient(timeout=settings.REQUEST_TIMEOUT) as client:
-                response = await client.get(self.base_url, params=params)
-                
-                if response.status_code == 404:
-                    raise HTTPException(
-                        status_code=404,
-                        detail=f"Location '{q}' not found"
-                    )
-                
-                if response.status_code != 200:
-                    logger.error(f"OpenWeather API error: {response.status_code}")
-                    raise HTTPException(
-                        status_code=response.status_code,
-                        detail="Weather service unavailable"
-                    )
-                
-                data = response.json()
-                return self._format_weather_response(data)
+            response = await http_client_manager.request(
+                "openweather", "GET", self.base_url,
+                params=params,
+                timeout=settings.REQUEST_TIMEOUT
+            )
+            
+            if response.status_code == 404:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Location '{q}' not found"
+                )
+            
+            if response.status_code != 200:
+                logger.error(f"OpenWeather API error: {response.status_code}")
+                raise HTTPException(
+                    status_code=response.status_code,
+                    detail="Weather service unavailable"
+                )
+            
+            return fast_json.loads(response.content)
                     
         except httpx.TimeoutException:
             logger.error("Timeout when calling OpenWeather API")
@@ -0,0 +1,110 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+_caches: List["TTLCache"] = []
+
+
+class TTLCache:
+    """Bounded in-process cache with per-entry TTL and LRU eviction.
+
+    Entries past their TTL can still be served for ``stale_ttl`` seconds
+    through ``get_entry`` so callers can implement stale-while-revalidate.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, stale_ttl: float = 0, name: Optional[str] = None):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._data: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if name:
+            _caches.append(self)
+
+    def get_entry(self, key: Hashable) -> Optional[Tuple[Any, bool]]:
+        """Return (value, is_stale) or None if missing or past the stale window"""
+
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+
+        value, expires_at = item
+        now = time.monotonic()
+
+        if now < expires_at:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value, False
+
+        if now < expires_at + self.stale_ttl:
+            self._data.move_to_end(key)
+            self.stale_hits += 1
+            return value, True
+
+        del self._data[key]
+        self.misses += 1
+        return None
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return a fresh value or None"""
+
+        item = self._data.get(key)
+        if item is None or time.monotonic() >= item[1]:
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return item[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store a value, evicting the least recently used entries if full"""
+
+        if self.maxsize <= 0:
+            return
+
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """Size and hit/miss counters"""
+
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "stale_ttl": self.stale_ttl,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0
+        }
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Counters for every named cache created in the process"""
+
+    return {c.name: c.stats() for c in _caches}
@@ -0,0 +1,186 @@
+import asyncio
+import json
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Hashable, Optional, Tuple
+from app.config import settings
+from app.utils.cache import TTLCache
+from app.utils.sqlite_cache import SQLiteCache
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(ABC):
+    """Async key/value cache the services store through.
+
+    Keys are strings or tuples of primitives. Values must be JSON-serializable
+    so a shared backend can hand them to other worker processes.
+    """
+
+    name: str = ""
+
+    @abstractmethod
+    async def get_entry(self, key: Hashable) -> Optional[Tuple[Any, bool]]:
+        """Return (value, is_stale) or None"""
+
+    async def get(self, key: Hashable) -> Optional[Any]:
+        """Return a fresh value or None"""
+
+        entry = await self.get_entry(key)
+        if entry is None or entry[1]:
+            return None
+        return entry[0]
+
+    @abstractmethod
+    async def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store a value; ttl overrides the backend's default"""
+
+    @abstractmethod
+    async def add(self, key: Hashable, value: Any, ttl: float) -> bool:
+        """Store only if missing; True if this call stored it (usable as a short lease)"""
+
+    @abstractmethod
+    async def delete(self, key: Hashable):
+        """Drop a key if present"""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Size and hit counters for the metrics endpoint"""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process cache, the default for single-worker deployments"""
+
+    def __init__(self, name: str, maxsize: int, ttl: float, stale_ttl: float = 0):
+        self.name = name
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl, stale_ttl=stale_ttl, name=name)
+
+    async def get_entry(self, key: Hashable) -> Optional[Tuple[Any, bool]]:
+        return self._cache.get_entry(key)
+
+    async def get(self, key: Hashable) -> Optional[Any]:
+        return self._cache.get(key)
+
+    async def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        self._cache.set(key, value, ttl=ttl)
+
+    async def add(self, key: Hashable, value: Any, ttl: float) -> bool:
+        if self._cache.get(key) is not None:
+            return False
+        self._cache.set(key, value, ttl=ttl)
+        return True
+
+    async def delete(self, key: Hashable):
+        self._cache.delete(key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "memory", **self._cache.stats()}
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Cache shared by every worker on the host: a memory tier over a SQLite table.
+
+    Entries live in the memory tier for at most ``local_ttl`` seconds, so a
+    value written by another worker is seen within that window. Store I/O runs
+    in a thread so the event loop never blocks on disk. The table is capped at
+    ``max_rows``, ``maxsize`` unless given.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float, stale_ttl: float = 0,
+                 path: Optional[str] = None, local_ttl: Optional[float] = None,
+                 max_rows: Optional[int] = None):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.local_ttl = settings.SHARED_CACHE_LOCAL_TTL if local_ttl is None else local_ttl
+        self._memory = TTLCache(maxsize=maxsize, ttl=ttl, name=name)
+        self._store = SQLiteCache(
+            path or settings.SHARED_CACHE_PATH, table=name,
+            max_rows=maxsize if max_rows is None else max_rows,
+            purge_interval=settings.SHARED_CACHE_PURGE_INTERVAL
+        )
+        self.store_hits = 0
+        self.store_misses = 0
+        self.store_errors = 0
+
+    def _store_key(self, key: Hashable) -> str:
+        return key if isinstance(key, str) else json.dumps(key, separators=(",", ":"), default=str)
+
+    async def get_entry(self, key: Hashable) -> Optional[Tuple[Any, bool]]:
+        value = self._memory.get(key) if self.local_ttl > 0 else None
+        if value is not None:
+            return value, False
+
+        try:
+            row = await asyncio.to_thread(self._store.get_entry, self._store_key(key))
+        except Exception as e:
+            self.store_errors += 1
+            logger.warning(f"Shared cache read failed for {self.name}: {e}")
+            return None
+
+        if row is None:
+            self.store_misses += 1
+            return None
+
+        self.store_hits += 1
+        value, expires_at = row
+        # Rows are kept for ttl + stale_ttl; the last stale_ttl seconds are stale
+        remaining = expires_at - self.stale_ttl - time.time()
+        if remaining <= 0:
+            return value, True
+
+        if self.local_ttl > 0:
+            self._memory.set(key, value, ttl=min(remaining, self.local_ttl))
+        return value, False
+
+    async def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else ttl
+        if self.local_ttl > 0:
+            self._memory.set(key, value, ttl=min(ttl, self.local_ttl))
+
+        try:
+            await asyncio.to_thread(self._store.set, self._store_key(key), value, ttl + self.stale_ttl)
+        except Exception as e:
+            self.store_errors += 1
+            logger.warning(f"Shared cache write failed for {self.name}: {e}")
+
+    async def add(self, key: Hashable, value: Any, ttl: float) -> bool:
+        try:
+            return await asyncio.to_thread(self._store.add, self._store_key(key), value, ttl)
+        except Exception as e:
+            # Without the store every worker acts alone, as with the memory backend
+            self.store_errors += 1
+            logger.warning(f"Shared cache add failed for {self.name}: {e}")
+            return True
+
+    async def delete(self, key: Hashable):
+        self._memory.delete(key)
+        try:
+            await asyncio.to_thread(self._store.delete, self._store_key(key))
+        except Exception as e:
+            self.store_errors += 1
+            logger.warning(f"Shared cache delete failed for {self.name}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "sqlite",
+            **self._memory.stats(),
+            "store_hits": self.store_hits,
+            "store_misses": self.store_misses,
+            "store_errors": self.store_errors
+        }
+
+
+def create_cache(name: str, maxsize: int, ttl: float, stale_ttl: float = 0,
+                 shared: Optional[bool] = None, path: Optional[str] = None,
+                 local_ttl: Optional[float] = None, max_rows: Optional[int] = None) -> CacheBackend:
+    """Cache for a service; shared across workers when CACHE_BACKEND is 'sqlite'"""
+
+    if shared is None:
+        shared = settings.CACHE_BACKEND == "sqlite"
+
+    if shared:
+        return SQLiteCacheBackend(name, maxsize, ttl, stale_ttl=stale_ttl, path=path,
+                                  local_ttl=local_ttl, max_rows=max_rows)
+    return MemoryCacheBackend(name, maxsize, ttl, stale_ttl=stale_ttl)
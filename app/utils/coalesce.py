@@ -0,0 +1,72 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List
+from app.utils import deadline
+
+_coalescers: List["RequestCoalescer"] = []
+
+
+class RequestCoalescer:
+    """Share one upstream call between concurrent callers with the same key.
+
+    The first caller for a key starts the call; everyone arriving while it
+    is in flight awaits the same future and gets its result or exception.
+    The call itself runs without a request deadline, since it serves every
+    waiter; each waiter stops waiting at its own deadline instead.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+        self.calls = 0
+        self.upstream_calls = 0
+        _coalescers.append(self)
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Await the in-flight call for key, starting it with factory if needed"""
+
+        self.calls += 1
+
+        future = self._inflight.get(key)
+        if future is None:
+            self.upstream_calls += 1
+            future = asyncio.ensure_future(self._shared(factory))
+            self._inflight[key] = future
+            future.add_done_callback(lambda f: self._finish(key, f))
+
+        # Waiting (rather than awaiting) means a caller that gives up or is
+        # cancelled leaves the call running for the others
+        await asyncio.wait({future}, timeout=deadline.remaining())
+        if not future.done():
+            raise deadline.exceeded(self.name)
+        return future.result()
+
+    async def _shared(self, factory: Callable[[], Awaitable[Any]]) -> Any:
+        # The first caller's deadline must not cut the call short for later waiters
+        token = deadline.start(None)
+        try:
+            return await factory()
+        finally:
+            deadline.reset(token)
+
+    def _finish(self, key: Hashable, future: asyncio.Future):
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+
+        # Mark the exception as retrieved in case every waiter was cancelled
+        if not future.cancelled():
+            future.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "upstream_calls": self.upstream_calls,
+            "saved_calls": self.calls - self.upstream_calls,
+            "in_flight": len(self._inflight)
+        }
+
+
+def coalescing_stats() -> Dict[str, Dict[str, Any]]:
+    """Counters for every coalescer created in the process"""
+
+    return {c.name: c.stats() for c in _coalescers}
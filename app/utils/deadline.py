@@ -0,0 +1,116 @@
+import time
+from contextvars import ContextVar, Token
+from typing import Optional
+import httpx
+from fastapi import HTTPException
+from app.config import settings
+from app.utils.metrics import deadline_misses
+
+
+class DeadlineExceeded(httpx.TimeoutException):
+    """Raised instead of calling an upstream once the request's deadline has passed"""
+
+
+class Deadline:
+    """When the current request must be answered by, on the monotonic clock"""
+
+    def __init__(self, budget: float):
+        self.budget = budget
+        self.expires_at = time.monotonic() + budget
+        # Where the deadline first ran out: "arrival", "upstream" or "response"
+        self.missed: Optional[str] = None
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+# Deadline of the request being served, set by DeadlineMiddleware
+_current: ContextVar[Optional[Deadline]] = ContextVar("deadline", default=None)
+
+
+def budget_for(path: str, header: Optional[str] = None) -> float:
+    """Seconds a request may take: the header's budget if valid, else the route default"""
+
+    if header is not None:
+        try:
+            return min(float(header), settings.DEADLINE_MAX_MS) / 1000
+        except ValueError:
+            pass
+
+    # Longest matching path prefix wins
+    for prefix in sorted(settings.DEADLINE_ROUTE_MS, key=len, reverse=True):
+        if path.startswith(prefix):
+            return settings.DEADLINE_ROUTE_MS[prefix] / 1000
+    return settings.DEADLINE_DEFAULT_MS / 1000
+
+
+def start(deadline: Optional[Deadline]) -> Token:
+    """Make deadline the current one; None runs the block without a deadline"""
+
+    return _current.set(deadline)
+
+
+def reset(token: Token):
+    _current.reset(token)
+
+
+def current() -> Optional[Deadline]:
+    return _current.get()
+
+
+def remaining() -> Optional[float]:
+    """Seconds left for the current request, None outside a request"""
+
+    deadline = _current.get()
+    return None if deadline is None else deadline.remaining()
+
+
+def clamp(timeout: Optional[float]) -> Optional[float]:
+    """The smaller of timeout and the time left; unchanged outside a request"""
+
+    left = remaining()
+    if left is None:
+        return timeout
+    # Keep the timeout positive; the next deadline check sheds the call anyway
+    left = max(left, 0.001)
+    return left if timeout is None else min(timeout, left)
+
+
+def allows(delay: float) -> bool:
+    """Whether waiting delay seconds still leaves time for another attempt"""
+
+    left = remaining()
+    return left is None or left > delay
+
+
+def expired() -> bool:
+    deadline = _current.get()
+    return deadline is not None and deadline.expired()
+
+
+def exceeded(upstream: str) -> DeadlineExceeded:
+    """Mark the current deadline as missed before an upstream call and build the error"""
+
+    deadline = _current.get()
+    if deadline is not None and deadline.missed is None:
+        deadline.missed = "upstream"
+    return DeadlineExceeded(f"Request deadline passed before {upstream} answered")
+
+
+async def shed_expired():
+    """App-wide dependency: answer 504 before any work if the budget is already spent"""
+
+    deadline = _current.get()
+    if deadline is not None and deadline.expired():
+        deadline.missed = "arrival"
+        raise HTTPException(
+            status_code=504,
+            detail="Request deadline already passed"
+        )
+
+
+def record_miss(route: Optional[str], stage: str):
+    deadline_misses.inc(route or "unmatched", stage)
@@ -0,0 +1,168 @@
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+from app.utils.cache import cache_stats
+from app.utils.coalesce import coalescing_stats
+
+# Seconds; tuned for voice turns where anything above ~2 s is noticeable
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + list(self._samples())
+
+    def _samples(self) -> Iterable[str]:
+        return []
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def _samples(self):
+        for labels, value in self._values.items():
+            yield f"{self.name}{_labels(self.labelnames, labels)} {value}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) - amount
+
+    def set(self, *labels: str, value: float):
+        self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._values: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, *labels: str):
+        state = self._values.get(labels)
+        if state is None:
+            state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+
+        state[0][bisect_left(self.buckets, value)] += 1
+        state[1] += value
+        state[2] += 1
+
+    def _samples(self):
+        for labels, (counts, total, count) in self._values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                bucket_labels = _labels(self.labelnames, labels, 'le="%s"' % le)
+                yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {total}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {count}"
+
+
+class Registry:
+    """Holds metrics plus callbacks that report pull-style stats at scrape time"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Iterable[str]]] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[str]]):
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "API request latency by route", ("method", "route", "status")))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "API requests currently being served"))
+upstream_request_duration = registry.register(Histogram(
+    "upstream_request_duration_seconds", "Upstream provider call latency", ("upstream", "status")))
+upstream_requests_in_flight = registry.register(Gauge(
+    "upstream_requests_in_flight", "Upstream calls currently in flight", ("upstream",)))
+token_refreshes = registry.register(Counter(
+    "amadeus_token_refresh_total", "Amadeus OAuth token fetches", ("result",)))
+circuit_state = registry.register(Gauge(
+    "upstream_circuit_state", "Circuit breaker state (0 closed, 1 open, 2 half-open)", ("upstream",)))
+upstream_retries = registry.register(Counter(
+    "upstream_retries_total", "Upstream calls retried, by cause", ("upstream", "reason")))
+upstream_hedges = registry.register(Counter(
+    "upstream_hedged_requests_total", "Backup requests fired for slow upstream calls", ("upstream",)))
+upstream_queue_depth = registry.register(Gauge(
+    "upstream_queue_depth", "Calls waiting for an upstream admission slot", ("upstream",)))
+upstream_queue_wait = registry.register(Histogram(
+    "upstream_queue_wait_seconds", "Time spent waiting for an upstream admission slot", ("upstream", "priority")))
+upstream_admission_rejections = registry.register(Counter(
+    "upstream_admission_rejections_total", "Upstream calls refused by admission control", ("upstream", "reason")))
+deadline_misses = registry.register(Counter(
+    "request_deadline_misses_total", "Requests that ran out of deadline, by where it ran out", ("route", "stage")))
+trip_brief_sections = registry.register(Counter(
+    "trip_brief_sections_total", "Trip brief sections by outcome at the deadline", ("section", "status")))
+
+
+def _cache_samples() -> Iterable[str]:
+    stats = cache_stats()
+    for metric, key, kind, help_text in (
+        ("cache_hits_total", "hits", "counter", "Fresh cache hits"),
+        ("cache_stale_hits_total", "stale_hits", "counter", "Stale cache hits served while revalidating"),
+        ("cache_misses_total", "misses", "counter", "Cache misses"),
+        ("cache_evictions_total", "evictions", "counter", "LRU evictions"),
+        ("cache_entries", "size", "gauge", "Entries currently cached"),
+        ("cache_hit_ratio", "hit_ratio", "gauge", "Hits over lookups since start"),
+    ):
+        yield f"# HELP {metric} {help_text}"
+        yield f"# TYPE {metric} {kind}"
+        for name, values in stats.items():
+            yield f'{metric}{{cache="{_escape(name)}"}} {values[key]}'
+
+    yield "# HELP coalesced_calls_saved_total Upstream calls avoided by request coalescing"
+    yield "# TYPE coalesced_calls_saved_total counter"
+    for name, values in coalescing_stats().items():
+        yield f'coalesced_calls_saved_total{{coalescer="{_escape(name)}"}} {values["saved_calls"]}'
+
+
+registry.add_collector(_cache_samples)
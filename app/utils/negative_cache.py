@@ -0,0 +1,51 @@
+from typing import Any, Dict, Hashable, Optional, Tuple
+from fastapi import HTTPException
+from app.config import settings
+from app.utils.cache_backend import create_cache
+
+
+class NegativeCache:
+    """Short-lived memory of inputs the upstreams rejected, shared by every service.
+
+    Only client errors (NEGATIVE_CACHE_STATUSES, 400 and 404 by default) are
+    kept, so an agent retrying the same bad input gets the original status
+    and message without another upstream round trip. Timeouts and 5xx are
+    never stored. Entries are bounded separately from the positive caches.
+    """
+
+    def __init__(self):
+        self._cache = create_cache(
+            "negative",
+            maxsize=settings.NEGATIVE_CACHE_MAX_ENTRIES,
+            ttl=settings.NEGATIVE_CACHE_TTL
+        )
+        self.hits: Dict[str, int] = {}
+
+    async def get(self, namespace: str, key: Hashable) -> Optional[Tuple[int, str]]:
+        """(status_code, detail) remembered for this input, or None"""
+
+        entry = await self._cache.get((namespace, key))
+        if entry is None:
+            return None
+
+        self.hits[namespace] = self.hits.get(namespace, 0) + 1
+        return entry["status_code"], entry["detail"]
+
+    async def check(self, namespace: str, key: Hashable):
+        """Raise the remembered HTTPException for this input, if any"""
+
+        entry = await self.get(namespace, key)
+        if entry is not None:
+            raise HTTPException(status_code=entry[0], detail=entry[1])
+
+    async def remember(self, namespace: str, key: Hashable, status_code: int, detail: Any):
+        """Store a rejection; ignored unless status_code is a cacheable client error"""
+
+        if status_code in settings.NEGATIVE_CACHE_STATUSES:
+            await self._cache.set((namespace, key), {"status_code": status_code, "detail": detail})
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._cache.stats(), "hits_by_service": dict(self.hits)}
+
+
+negative_cache = NegativeCache()
@@ -0,0 +1,135 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional, Tuple
+
+
+class SQLiteCache:
+    """Single-file key/value store with per-entry expiry.
+
+    Values are stored as JSON. The database runs in WAL mode so several
+    processes can read while one writes. Calls are blocking; async callers
+    should go through asyncio.to_thread.
+
+    Writes also keep the table bounded: every ``purge_interval`` seconds, or
+    after a tenth of ``max_rows`` writes, expired rows are deleted and the
+    rows closest to expiry are evicted down to ``max_rows``.
+    """
+
+    def __init__(self, path: str, table: str = "cache", max_rows: Optional[int] = None,
+                 purge_interval: float = 60.0):
+        self.path = path
+        self.table = table
+        self.max_rows = max_rows
+        self.purge_interval = purge_interval
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._purged_at = time.monotonic()
+        self._writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_expires_at ON {self.table} (expires_at)")
+            self._conn = conn
+
+        return self._conn
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the stored value, or None if missing or expired"""
+
+        entry = self.get_entry(key)
+        return None if entry is None else entry[0]
+
+    def get_entry(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Return (value, expires_at as a Unix time), or None if missing or expired"""
+
+        with self._lock:
+            row = self._connect().execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None or row[1] <= time.time():
+            return None
+
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: str, value: Any, ttl: float):
+        """Store a JSON-serializable value for ttl seconds"""
+
+        with self._lock:
+            self._connect().execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time() + ttl)
+            )
+            self._after_write()
+
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        """Store a value only if the key is missing or expired; True if it was stored"""
+
+        now = time.time()
+        with self._lock:
+            cursor = self._connect().execute(
+                f"INSERT INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at "
+                f"WHERE {self.table}.expires_at <= ?",
+                (key, json.dumps(value), now + ttl, now)
+            )
+            stored = cursor.rowcount > 0
+            self._after_write()
+        return stored
+
+    def delete(self, key: str):
+        with self._lock:
+            self._connect().execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def purge_expired(self) -> int:
+        """Remove expired rows and return how many were deleted"""
+
+        with self._lock:
+            return self._purge()
+
+    def _after_write(self):
+        # Called with the lock held
+        self._writes += 1
+        due = time.monotonic() - self._purged_at >= self.purge_interval
+        if due or (self.max_rows is not None and self._writes >= max(self.max_rows // 10, 1)):
+            self._purge()
+
+    def _purge(self) -> int:
+        conn = self._connect()
+        deleted = conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (time.time(),)).rowcount
+
+        if self.max_rows is not None:
+            # Keep the max_rows entries that expire last
+            deleted += conn.execute(
+                f"DELETE FROM {self.table} WHERE rowid IN "
+                f"(SELECT rowid FROM {self.table} ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_rows,)
+            ).rowcount
+
+        self._purged_at = time.monotonic()
+        self._writes = 0
+        return deleted
+
+    def count(self) -> int:
+        with self._lock:
+            return self._connect().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,52 @@
+"""Compare payload size and serialization time of raw vs projected flight results.
+
+Usage: python -m benchmarks.flight_projection [--offers 10] [--iterations 2000]
+"""
+
+import argparse
+import json
+import time
+
+from app.services.flight import flight_service
+from benchmarks.payloads import amadeus_flight_offers
+
+
+def _time_dumps(payload, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        json.dumps(payload)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--offers", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    raw = amadeus_flight_offers("JFK", "LHR", "2026-12-01", "2026-12-08", count=args.offers)
+    projected = flight_service.project_offers(raw, "JFK", "LHR")
+
+    raw_bytes = len(json.dumps(raw).encode())
+    projected_bytes = len(json.dumps(projected).encode())
+    raw_us = _time_dumps(raw, args.iterations)
+    projected_us = _time_dumps(projected, args.iterations)
+
+    start = time.perf_counter()
+    for _ in range(args.iterations):
+        flight_service.project_offers(raw, "JFK", "LHR")
+    projection_us = (time.perf_counter() - start) / args.iterations * 1e6
+
+    print(json.dumps({
+        "offers": args.offers,
+        "raw_bytes": raw_bytes,
+        "projected_bytes": projected_bytes,
+        "size_reduction": round(1 - projected_bytes / raw_bytes, 3),
+        "raw_serialize_us": round(raw_us, 1),
+        "projected_serialize_us": round(projected_us, 1),
+        "projection_us": round(projection_us, 1)
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
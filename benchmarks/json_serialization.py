@@ -0,0 +1,99 @@
+"""Serialization time and response size per endpoint: stdlib JSONResponse vs FastJSONResponse.
+
+Also reports what dropping the raw_data echo saves, and upstream decode time
+through httpx's Response.json() vs fast_json.loads on the raw bytes.
+
+Usage: python -m benchmarks.json_serialization [--iterations 2000] [--offers 10]
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict
+
+import httpx
+from fastapi.responses import JSONResponse
+
+from app.services.flight import flight_service
+from app.services.itinerary import itinerary_service
+from app.services.time import time_service
+from app.services.weather import weather_service
+from app.utils import fast_json
+from app.utils.fast_json import FastJSONResponse
+from benchmarks.payloads import (amadeus_flight_offers, exchangerate_latest, opentripmap_geoname,
+                                 openweather_current, timeapi_current)
+
+
+def _per_call_us(fn: Callable[[], Any], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def _endpoint_payloads(offers: int) -> Dict[str, Dict[str, Any]]:
+    raw_flights = amadeus_flight_offers("JFK", "LHR", "2026-12-01", "2026-12-08", count=offers)
+    geoname = opentripmap_geoname("London")
+    clock = timeapi_current("Europe/London")
+
+    return {
+        "flights_search": flight_service.project_offers(raw_flights, "JFK", "LHR"),
+        "flights_search_raw": raw_flights,
+        "weather_current": weather_service._format_weather_response(openweather_current("London,GB")),
+        "time_current": time_service._format_time_response(clock, "Europe/London"),
+        "time_current_with_raw": time_service._format_time_response(clock, "Europe/London", include_raw=True),
+        "itinerary_places": itinerary_service._format_itinerary_response(geoname, "London"),
+        "itinerary_places_with_raw": itinerary_service._format_itinerary_response(geoname, "London", include_raw=True),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--offers", type=int, default=10)
+    args = parser.parse_args()
+
+    endpoints = {}
+    for name, payload in _endpoint_payloads(args.offers).items():
+        stdlib_us = _per_call_us(lambda: JSONResponse(content=payload), args.iterations)
+        fast_us = _per_call_us(lambda: FastJSONResponse(content=payload), args.iterations)
+        endpoints[name] = {
+            "bytes": len(FastJSONResponse(content=payload).body),
+            "stdlib_render_us": round(stdlib_us, 2),
+            "fast_render_us": round(fast_us, 2),
+            "speedup": round(stdlib_us / fast_us, 2) if fast_us else None
+        }
+
+    for name in ("time_current", "itinerary_places"):
+        with_raw, without = endpoints[f"{name}_with_raw"], endpoints[name]
+        without["raw_data_bytes_saved"] = with_raw["bytes"] - without["bytes"]
+        without["raw_data_render_us_saved"] = round(with_raw["stdlib_render_us"] - without["fast_render_us"], 2)
+
+    decode = {}
+    for name, body in (
+        ("amadeus_flight_offers", amadeus_flight_offers("JFK", "LHR", "2026-12-01", "2026-12-08", count=args.offers)),
+        ("exchangerate_latest", exchangerate_latest("USD")),
+        ("openweather_current", openweather_current("London,GB")),
+    ):
+        content = json.dumps(body).encode()
+        response = httpx.Response(200, content=content, headers={"Content-Type": "application/json"})
+        # Response.json() decodes the text again on every call
+        stdlib_us = _per_call_us(lambda: json.loads(response.text), args.iterations)
+        fast_us = _per_call_us(lambda: fast_json.loads(response.content), args.iterations)
+        decode[name] = {
+            "bytes": len(content),
+            "stdlib_decode_us": round(stdlib_us, 2),
+            "fast_decode_us": round(fast_us, 2),
+            "speedup": round(stdlib_us / fast_us, 2) if fast_us else None
+        }
+
+    print(json.dumps({
+        "encoder": "orjson" if fast_json.orjson is not None else "json",
+        "iterations": args.iterations,
+        "responses": endpoints,
+        "upstream_decode": decode
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
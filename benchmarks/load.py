@@ -0,0 +1,349 @@
+"""Offline load benchmark: drives every router against local stub upstreams.
+
+Reports throughput and p50/p95/p99 latency per scenario and writes the
+results to a JSON file so runs can be compared.
+
+Usage: python -m benchmarks.load [--requests 200] [--concurrency 10] [--distinct 20]
+           [--scenarios flights_search,weather_current] [--latency amadeus=0.4,openweather=0.1]
+           [--error-rate openweather=0.05] [--serve] [--cold] [--output results.json]
+
+By default the stubs are mounted in-process through httpx.ASGITransport.
+With --serve they run on a local port behind uvicorn, so real sockets and the
+connection pools are in the path.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import math
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.stubs import StubConfig, UPSTREAMS, base_urls, create_stub_app
+
+RETELL_KEY = "key_benchmark_secret"
+RETELL_AGENT_ID = "agent_bda99a1b4a3929766994d78bae"
+ROUTES = [("JFK", "LHR"), ("BOS", "CDG"), ("LAX", "NRT"), ("New York", "London"), ("SFO", "FRA")]
+CITIES = ["London", "Paris", "Tokyo", "New York", "Berlin", "Madrid", "Rome", "Sydney", "Toronto", "Dubai"]
+ZONES = ["Europe/London", "America/New_York", "Asia/Tokyo", "tokyo", "PST", "Europe/Paris"]
+CURRENCIES = ["EUR", "GBP", "JPY", "CAD", "AUD", "CHF"]
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    path: str
+    body: Callable[[int], Any]
+
+
+def _day(i: int, distinct: int, offset: int = 0) -> str:
+    return (date.today() + timedelta(days=14 + i % distinct + offset)).isoformat()
+
+
+def build_scenarios(distinct: int) -> List[Scenario]:
+    def route(i):
+        return ROUTES[i % len(ROUTES)]
+
+    return [
+        Scenario("flights_search", "POST", "/api/flights/search", lambda i: {
+            "origin": route(i)[0], "destination": route(i)[1], "departure_date": _day(i, distinct)
+        }),
+        Scenario("flights_flexible", "POST", "/api/flights/search/flexible", lambda i: {
+            "origin": route(i)[0], "destination": route(i)[1],
+            "departure_date_from": _day(i, distinct), "departure_date_to": _day(i, distinct, offset=2)
+        }),
+        Scenario("flights_batch", "POST", "/api/flights/search/batch", lambda i: {
+            "origins": ["JFK", "BOS"], "destinations": ["LHR", "CDG"], "departure_date": _day(i, distinct)
+        }),
+        Scenario("airports_lookup", "POST", "/api/flights/airports/lookup", lambda i: {
+            "q": ["heathrow", "new york", "san fran", "paris", "JFK"][i % 5]
+        }),
+        Scenario("weather_current", "POST", "/api/weather/current", lambda i: {
+            "q": CITIES[i % min(distinct, len(CITIES))]
+        }),
+        Scenario("weather_batch", "POST", "/api/weather/batch", lambda i: {
+            "locations": [CITIES[i % len(CITIES)], CITIES[(i + 1) % len(CITIES)], CITIES[(i + 2) % len(CITIES)]]
+        }),
+        Scenario("exchange_convert", "POST", "/api/exchange/convert", lambda i: {
+            "from": "USD", "to": CURRENCIES[i % len(CURRENCIES)], "amount": 100 + i
+        }),
+        Scenario("exchange_bulk", "POST", "/api/exchange/convert/bulk", lambda i: {
+            "from": "USD", "to": CURRENCIES[:3], "amounts": [245.1, 512.0, 1033.5]
+        }),
+        Scenario("time_current", "POST", "/api/time/current", lambda i: {
+            "timeZone": ZONES[i % len(ZONES)]
+        }),
+        Scenario("itinerary_places", "POST", "/api/itinerary/places", lambda i: {
+            "name": CITIES[i % min(distinct, len(CITIES))]
+        }),
+        Scenario("trip_brief", "POST", "/api/trip/brief", lambda i: {
+            "destination": CITIES[i % min(distinct, len(CITIES))], "from": "USD",
+            "to": CURRENCIES[i % len(CURRENCIES)], "amount": 100 + i
+        }),
+        Scenario("retell_agent", "POST", f"/api/retell/agent/{RETELL_AGENT_ID}", lambda i: {
+            "interaction_type": "response_required", "response_id": i,
+            "transcript": [{"role": "user", "content": "I'd like to fly from New York to London."}]
+        }),
+    ]
+
+
+def _configure_environment(stub_root: str, cache_dir: str):
+    """Point the services at the stubs; must run before the app is imported"""
+
+    os.environ.update(base_urls(stub_root))
+    os.environ.update({
+        "AMADEUS_API_KEY": "bench", "AMADEUS_API_SECRET": "bench", "OPENWEATHER_API_KEY": "bench",
+        "OPENTRIPMAP_API_KEY": "bench", "EXCHANGERATE_API_KEY": "bench", "RETELL_API_KEY": RETELL_KEY,
+        "GEONAME_CACHE_PATH": os.path.join(cache_dir, "geonames.sqlite3"),
+        "SHARED_CACHE_PATH": os.path.join(cache_dir, "shared.sqlite3"),
+        "LOG_LEVEL": os.environ.get("LOG_LEVEL", "WARNING")
+    })
+
+
+def _serve_stub(stub_app) -> str:
+    """Run the stub app on a free local port in a background thread"""
+
+    import uvicorn
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(stub_app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return f"http://127.0.0.1:{port}"
+
+
+def _sign(body: bytes) -> str:
+    timestamp = str(int(time.time() * 1000))
+    digest = hmac.new(RETELL_KEY.encode(), body + timestamp.encode(), hashlib.sha256).hexdigest()
+    return f"v={timestamp},d={digest}"
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    # Nearest-rank percentile
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def summarize(latencies: List[float], wall: float) -> Dict[str, float]:
+    """Throughput plus latency percentiles in milliseconds"""
+
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "throughput_rps": round(len(ordered) / wall, 1) if wall else 0.0,
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2) if ordered else 0.0,
+        "p50_ms": round(_percentile(ordered, 50) * 1000, 2),
+        "p95_ms": round(_percentile(ordered, 95) * 1000, 2),
+        "p99_ms": round(_percentile(ordered, 99) * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2) if ordered else 0.0
+    }
+
+
+async def _drive(total: int, concurrency: int, call: Callable[[int], Any]) -> float:
+    """Run call(i) for i in range(total) with at most `concurrency` in flight; return wall time"""
+
+    indexes = iter(range(total))
+
+    async def worker():
+        for i in indexes:
+            await call(i)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start
+
+
+async def run_http_scenario(client, scenario: Scenario, total: int, concurrency: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    app_errors = 0
+
+    async def call(i: int):
+        nonlocal app_errors
+        body = json.dumps(scenario.body(i)).encode()
+        headers = {"Content-Type": "application/json"}
+        if scenario.name.startswith("retell"):
+            headers["X-Retell-Signature"] = _sign(body)
+
+        start = time.perf_counter()
+        try:
+            response = await client.request(scenario.method, scenario.path, content=body, headers=headers)
+            status = str(response.status_code)
+        except Exception as e:
+            response, status = None, type(e).__name__
+        latencies.append(time.perf_counter() - start)
+        statuses[status] = statuses.get(status, 0) + 1
+
+        # Some routers report failures inside a 200 body
+        if response is not None and response.status_code == 200:
+            payload = response.json()
+            if isinstance(payload, dict) and "error" in payload:
+                app_errors += 1
+
+    wall = await _drive(total, concurrency, call)
+    failed = sum(count for status, count in statuses.items() if not status.startswith(("2", "4")))
+    return {**summarize(latencies, wall), "statuses": statuses, "failed": failed, "app_errors": app_errors}
+
+
+async def run_retell_llm_scenario(total: int, concurrency: int, distinct: int) -> Dict[str, Any]:
+    """Drive RetellLLMSession directly with a stand-in for the WebSocket client"""
+
+    from app.services.retell_llm import RetellLLMSession
+
+    first_chunk: List[float] = []
+    complete: List[float] = []
+
+    async def call(i: int):
+        done = asyncio.Event()
+        start = time.perf_counter()
+        seen_first = False
+
+        async def send(message: Dict[str, Any]):
+            nonlocal seen_first
+            if message.get("response_type") != "response" or message.get("response_id") != 1:
+                return
+            if not seen_first:
+                first_chunk.append(time.perf_counter() - start)
+                seen_first = True
+            if message.get("content_complete"):
+                complete.append(time.perf_counter() - start)
+                done.set()
+
+        origin, destination = ROUTES[i % len(ROUTES)]
+        session = RetellLLMSession(f"bench-{i}", send)
+        await session.handle({
+            "interaction_type": "response_required", "response_id": 1,
+            "transcript": [{"role": "user", "content": f"Flights from {origin} to {destination} on {_day(i, distinct)}"}]
+        })
+        await done.wait()
+        await session.close()
+
+    wall = await _drive(total, concurrency, call)
+    return {**summarize(complete, wall), "first_chunk": summarize(first_chunk, wall)}
+
+
+def _parse_mapping(text: Optional[str]) -> Dict[str, float]:
+    result: Dict[str, float] = {}
+    for item in filter(None, (text or "").split(",")):
+        name, _, value = item.partition("=")
+        if name not in UPSTREAMS:
+            raise SystemExit(f"Unknown upstream '{name}', expected one of {', '.join(UPSTREAMS)}")
+        result[name] = float(value)
+    return result
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return None
+
+
+async def run(args) -> Dict[str, Any]:
+    stub_config = StubConfig(error_rate=_parse_mapping(args.error_rate), jitter=args.jitter)
+    stub_config.latency.update(_parse_mapping(args.latency))
+    stub_app = create_stub_app(stub_config)
+
+    stub_root = _serve_stub(stub_app) if args.serve else "http://stubs.local"
+    _configure_environment(stub_root, tempfile.mkdtemp(prefix="bench-cache-"))
+
+    import httpx
+    import main
+    from app.services.admission import admission
+    from app.services.http_client import http_client_manager
+    from app.utils.cache import _caches
+
+    if not args.serve:
+        # Every upstream client talks to the stub app in-process
+        stub_transport = httpx.ASGITransport(app=stub_app)
+        http_client_manager._build_client = lambda upstream: httpx.AsyncClient(transport=stub_transport)
+
+    scenarios = build_scenarios(args.distinct)
+    selected = set(filter(None, (args.scenarios or "").split(",")))
+    results: Dict[str, Any] = {}
+
+    async with main.app.router.lifespan_context(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://api.local", timeout=60) as client:
+            for scenario in scenarios + [Scenario("retell_llm_ws", "WS", "/api/retell/llm-websocket", None)]:
+                if selected and scenario.name not in selected:
+                    continue
+                if args.cold:
+                    for cache in _caches:
+                        cache.clear()
+
+                calls_before = dict(stub_config.calls)
+                if scenario.method == "WS":
+                    result = await run_retell_llm_scenario(args.requests, args.concurrency, args.distinct)
+                else:
+                    result = await run_http_scenario(client, scenario, args.requests, args.concurrency)
+                result["upstream_calls"] = {
+                    name: count - calls_before.get(name, 0)
+                    for name, count in stub_config.calls.items() if count != calls_before.get(name, 0)
+                }
+                results[scenario.name] = result
+                print(f"{scenario.name:18} {result['throughput_rps']:>8} rps  p50 {result['p50_ms']:>8} ms  "
+                      f"p95 {result['p95_ms']:>8} ms  p99 {result['p99_ms']:>8} ms", file=sys.stderr)
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "distinct_inputs": args.distinct,
+            "cold_caches": args.cold,
+            "transport": "uvicorn" if args.serve else "asgi",
+            "stub_latency_s": stub_config.latency,
+            "stub_error_rate": stub_config.error_rate,
+            "stub_jitter": stub_config.jitter
+        },
+        "scenarios": results,
+        "admission": admission.stats()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--distinct", type=int, default=20, help="Distinct inputs each scenario rotates through")
+    parser.add_argument("--scenarios", help="Comma separated scenario names (default: all)")
+    parser.add_argument("--latency", help="Stub latency overrides in seconds, e.g. amadeus=0.4")
+    parser.add_argument("--error-rate", help="Injected 503 rates, e.g. openweather=0.05")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Relative latency jitter")
+    parser.add_argument("--serve", action="store_true", help="Serve the stubs on a local port via uvicorn")
+    parser.add_argument("--cold", action="store_true", help="Clear in-memory caches before each scenario")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/load-<timestamp>.json)")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+
+    output = args.output or os.path.join("benchmarks", "results", f"load-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""Synthetic upstream payloads shaped like the real provider responses."""
+
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+CARRIERS = {
+    "BA": "BRITISH AIRWAYS",
+    "AA": "AMERICAN AIRLINES",
+    "VS": "VIRGIN ATLANTIC",
+    "DL": "DELTA AIR LINES",
+    "UA": "UNITED AIRLINES",
+    "IB": "IBERIA"
+}
+
+
+def _segment(carrier: str, origin: str, destination: str, departure: datetime, minutes: int,
+             segment_id: int) -> Dict[str, Any]:
+    arrival = departure + timedelta(minutes=minutes)
+    return {
+        "departure": {"iataCode": origin, "terminal": "4", "at": departure.strftime("%Y-%m-%dT%H:%M:%S")},
+        "arrival": {"iataCode": destination, "terminal": "5", "at": arrival.strftime("%Y-%m-%dT%H:%M:%S")},
+        "carrierCode": carrier,
+        "number": str(100 + segment_id),
+        "aircraft": {"code": "77W"},
+        "operating": {"carrierCode": carrier},
+        "duration": f"PT{minutes // 60}H{minutes % 60}M",
+        "id": str(segment_id),
+        "numberOfStops": 0,
+        "blacklistedInEU": False
+    }
+
+
+def _itinerary(rng: random.Random, origin: str, destination: str, date: str, first_id: int) -> Dict[str, Any]:
+    carrier = rng.choice(list(CARRIERS))
+    departure = datetime.strptime(date, "%Y-%m-%d") + timedelta(hours=rng.randint(6, 22))
+
+    if rng.random() < 0.5:
+        minutes = rng.randint(380, 480)
+        segments = [_segment(carrier, origin, destination, departure, minutes, first_id)]
+    else:
+        first, second = rng.randint(120, 300), rng.randint(300, 420)
+        segments = [
+            _segment(carrier, origin, "BOS", departure, first, first_id),
+            _segment(carrier, "BOS", destination, departure + timedelta(minutes=first + 90), second, first_id + 1)
+        ]
+        minutes = first + 90 + second
+
+    return {"duration": f"PT{minutes // 60}H{minutes % 60}M", "segments": segments}
+
+
+def amadeus_flight_offers(origin: str, destination: str, departure_date: str,
+                          return_date: Optional[str] = None, count: int = 10,
+                          currency: str = "USD", seed: Optional[int] = None) -> Dict[str, Any]:
+    """A flight-offers response with full fare details and dictionaries"""
+
+    rng = random.Random(seed if seed is not None else f"{origin}{destination}{departure_date}{return_date}")
+    offers: List[Dict[str, Any]] = []
+
+    for offer_id in range(1, count + 1):
+        itineraries = [_itinerary(rng, origin, destination, departure_date, offer_id * 10)]
+        if return_date:
+            itineraries.append(_itinerary(rng, destination, origin, return_date, offer_id * 10 + 5))
+
+        total = f"{rng.uniform(250, 1500):.2f}"
+        segment_ids = [s["id"] for it in itineraries for s in it["segments"]]
+        offers.append({
+            "type": "flight-offer",
+            "id": str(offer_id),
+            "source": "GDS",
+            "instantTicketingRequired": False,
+            "nonHomogeneous": False,
+            "oneWay": False,
+            "lastTicketingDate": departure_date,
+            "numberOfBookableSeats": rng.randint(1, 9),
+            "itineraries": itineraries,
+            "price": {
+                "currency": currency,
+                "total": total,
+                "base": f"{float(total) * 0.7:.2f}",
+                "fees": [{"amount": "0.00", "type": "SUPPLIER"}, {"amount": "0.00", "type": "TICKETING"}],
+                "grandTotal": total
+            },
+            "pricingOptions": {"fareType": ["PUBLISHED"], "includedCheckedBagsOnly": True},
+            "validatingAirlineCodes": [itineraries[0]["segments"][0]["carrierCode"]],
+            "travelerPricings": [{
+                "travelerId": "1",
+                "fareOption": "STANDARD",
+                "travelerType": "ADULT",
+                "price": {"currency": currency, "total": total, "base": f"{float(total) * 0.7:.2f}"},
+                "fareDetailsBySegment": [{
+                    "segmentId": segment_id,
+                    "cabin": "ECONOMY",
+                    "fareBasis": "OLN0P9B1",
+                    "brandedFare": "BASIC",
+                    "class": "O",
+                    "includedCheckedBags": {"quantity": 0},
+                    "amenities": [
+                        {"description": "CHECKED BAG 1PC", "isChargeable": True, "amenityType": "BAGGAGE"},
+                        {"description": "SNACK", "isChargeable": False, "amenityType": "MEAL"},
+                        {"description": "CHANGEABLE TICKET", "isChargeable": True, "amenityType": "BRANDED_FARES"}
+                    ]
+                } for segment_id in segment_ids]
+            }]
+        })
+
+    return {
+        "meta": {"count": len(offers), "links": {"self": "https://test.api.amadeus.com/v2/shopping/flight-offers"}},
+        "data": offers,
+        "dictionaries": {
+            "locations": {code: {"cityCode": code[:3], "countryCode": "XX"} for code in (origin, destination, "BOS")},
+            "aircraft": {"77W": "BOEING 777-300ER"},
+            "currencies": {currency: "US DOLLAR"},
+            "carriers": CARRIERS
+        }
+    }
+
+
+def openweather_current(q: str) -> Dict[str, Any]:
+    """An OpenWeather current weather response for a spoken location"""
+
+    rng = random.Random(q.lower())
+    city, _, country = q.partition(",")
+    return {
+        "coord": {"lon": round(rng.uniform(-180, 180), 4), "lat": round(rng.uniform(-60, 70), 4)},
+        "weather": [{"id": 803, "main": "Clouds", "description": "broken clouds", "icon": "04d"}],
+        "base": "stations",
+        "main": {
+            "temp": round(rng.uniform(-5, 32), 2),
+            "feels_like": round(rng.uniform(-8, 34), 2),
+            "temp_min": round(rng.uniform(-8, 20), 2),
+            "temp_max": round(rng.uniform(20, 35), 2),
+            "pressure": rng.randint(990, 1030),
+            "humidity": rng.randint(20, 95)
+        },
+        "visibility": 10000,
+        "wind": {"speed": round(rng.uniform(0, 12), 2), "deg": rng.randint(0, 359)},
+        "clouds": {"all": rng.randint(0, 100)},
+        "dt": int(datetime.now().timestamp()),
+        "sys": {"country": (country.strip() or "XX").upper()[:2]},
+        "timezone": 0,
+        "id": rng.randint(100000, 9999999),
+        "name": city.strip().title(),
+        "cod": 200
+    }
+
+
+def exchangerate_latest(base: str, now: Optional[float] = None) -> Dict[str, Any]:
+    """An ExchangeRate-API latest response with a full rate table"""
+
+    rng = random.Random(base)
+    now = now or datetime.now().timestamp()
+    codes = ("USD", "EUR", "GBP", "JPY", "CAD", "AUD", "CHF", "CNY", "INR", "MXN", "BRL", "SEK", "NZD", "SGD")
+    rates = {code: round(rng.uniform(0.5, 150) if code != base else 1.0, 6) for code in codes}
+    return {
+        "result": "success",
+        "documentation": "https://www.exchangerate-api.com/docs",
+        "terms_of_use": "https://www.exchangerate-api.com/terms",
+        "time_last_update_unix": int(now),
+        "time_last_update_utc": datetime.fromtimestamp(now, timezone.utc).strftime("%a, %d %b %Y %H:%M:%S +0000"),
+        "time_next_update_unix": int(now) + 3600,
+        "time_next_update_utc": datetime.fromtimestamp(now + 3600, timezone.utc).strftime("%a, %d %b %Y %H:%M:%S +0000"),
+        "base_code": base,
+        "conversion_rates": rates
+    }
+
+
+def timeapi_current(zone: str) -> Dict[str, Any]:
+    """A TimeAPI current zone response (UTC clock, the zone name echoed back)"""
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return {
+        "year": now.year,
+        "month": now.month,
+        "day": now.day,
+        "hour": now.hour,
+        "minute": now.minute,
+        "seconds": now.second,
+        "milliSeconds": now.microsecond // 1000,
+        "dateTime": now.isoformat(),
+        "date": now.strftime("%m/%d/%Y"),
+        "time": now.strftime("%H:%M"),
+        "timeZone": zone,
+        "dayOfWeek": now.strftime("%A"),
+        "dstActive": False
+    }
+
+
+def opentripmap_geoname(name: str) -> Dict[str, Any]:
+    """An OpenTripMap geoname response"""
+
+    rng = random.Random(name.lower())
+    return {
+        "name": name.title(),
+        "country": "XX",
+        "lat": round(rng.uniform(-60, 70), 5),
+        "lon": round(rng.uniform(-180, 180), 5),
+        "population": rng.randint(10000, 9000000),
+        "timezone": "Europe/London",
+        "status": "OK"
+    }
@@ -0,0 +1,81 @@
+"""Micro-benchmark of Retell webhook signature overhead.
+
+Compares the old path (parse, re-serialize, verify through the SDK)
+with verification over the raw body followed by a single parse.
+
+Usage: python -m benchmarks.retell_webhook [--iterations 20000] [--transcript-turns 20]
+"""
+
+import argparse
+import json
+import time
+
+from retell.lib.webhook_auth import symmetric, verify
+
+from app.config import settings
+from app.services.retell import retell_service
+
+API_KEY = "key_benchmark_secret"
+
+
+def _payload(turns: int) -> bytes:
+    transcript = [
+        {"role": "user" if i % 2 else "agent", "content": f"Turn {i}: I'd like to fly from New York to London on the 12th."}
+        for i in range(turns)
+    ]
+    body = {"interaction_type": "response_required", "response_id": turns, "transcript": transcript}
+    return json.dumps(body, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def _old_path(body: bytes, signature: str) -> bool:
+    post_data = json.loads(body.decode())
+    serialized = json.dumps(post_data, separators=(",", ":"), ensure_ascii=False)
+    return verify(serialized, API_KEY, signature)
+
+
+def _new_path(body: bytes, signature: str) -> bool:
+    if not retell_service.verify_signature(body, signature):
+        return False
+    json.loads(body)
+    return True
+
+
+def _time(func, body: bytes, signature: str, iterations: int) -> float:
+    assert func(body, signature)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(body, signature)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--transcript-turns", type=int, default=20)
+    args = parser.parse_args()
+
+    settings.RETELL_API_KEY = API_KEY
+    settings.VERIFY_RETELL_SIGNATURE = True
+
+    body = _payload(args.transcript_turns)
+    signature = symmetric["sign"](body.decode(), API_KEY)
+
+    old_us = _time(_old_path, body, signature, args.iterations)
+    new_us = _time(_new_path, body, signature, args.iterations)
+
+    start = time.perf_counter()
+    for _ in range(args.iterations):
+        retell_service.verify_signature(body, "")
+    reject_us = (time.perf_counter() - start) / args.iterations * 1e6
+
+    print(json.dumps({
+        "body_bytes": len(body),
+        "old_path_us": round(old_us, 2),
+        "new_path_us": round(new_us, 2),
+        "speedup": round(old_us / new_us, 2),
+        "missing_signature_reject_us": round(reject_us, 3)
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
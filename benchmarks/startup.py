@@ -0,0 +1,125 @@
+"""Cold-start report: import time by package and time-to-first-response.
+
+The import report comes from ``python -X importtime -c "import main"``.
+Time-to-first-response starts uvicorn in a fresh process and polls /health
+until it answers. With --budget-ms the exit status is 1 when the median
+time-to-first-response is over budget, so CI can enforce it.
+
+Usage: python -m benchmarks.startup [--runs 5] [--top 15] [--budget-ms 1500] [--output startup.json]
+"""
+
+import argparse
+import json
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+import httpx
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def import_report(top: int) -> Dict[str, Any]:
+    """Self and cumulative import time of main, grouped by top-level package"""
+
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                            capture_output=True, text=True, check=True)
+
+    modules: List[Dict[str, Any]] = []
+    packages: Dict[str, int] = {}
+    total_us = 0
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = int(match.group(1)), int(match.group(2)), match.group(3), match.group(4)
+        modules.append({"module": name, "self_ms": round(self_us / 1000, 2), "cumulative_ms": round(cumulative_us / 1000, 2)})
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us
+        if name == "main" and len(indent) == 1:
+            total_us = cumulative_us
+
+    return {
+        "import_main_ms": round(total_us / 1000, 2),
+        "by_package_ms": {name: round(us / 1000, 2)
+                          for name, us in sorted(packages.items(), key=lambda item: -item[1])[:top]},
+        "slowest_modules": sorted(modules, key=lambda m: -m["self_ms"])[:top]
+    }
+
+
+def time_to_first_response(timeout: float = 30.0) -> float:
+    """Seconds from spawning uvicorn until /health answers 200"""
+
+    port = _free_port()
+    env = dict(os.environ, LOG_LEVEL=os.environ.get("LOG_LEVEL", "WARNING"))
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+    try:
+        with httpx.Client(timeout=1.0) as client:
+            while time.perf_counter() - start < timeout:
+                if process.poll() is not None:
+                    raise RuntimeError(f"uvicorn exited with status {process.returncode}")
+                try:
+                    if client.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                        return time.perf_counter() - start
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.005)
+        raise RuntimeError(f"No response within {timeout} s")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts to measure")
+    parser.add_argument("--top", type=int, default=15, help="Packages and modules to list")
+    parser.add_argument("--budget-ms", type=float, help="Fail if median time-to-first-response exceeds this")
+    parser.add_argument("--output", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    samples = [time_to_first_response() * 1000 for _ in range(args.runs)]
+    median = statistics.median(samples)
+
+    report = {
+        "python": sys.version.split()[0],
+        "imports": import_report(args.top),
+        "time_to_first_response_ms": {
+            "runs": [round(s, 1) for s in samples],
+            "median": round(median, 1),
+            "max": round(max(samples), 1)
+        },
+        "budget_ms": args.budget_ms,
+        "within_budget": None if args.budget_ms is None else median <= args.budget_ms
+    }
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+
+    if report["within_budget"] is False:
+        print(f"Startup over budget: median {median:.0f} ms > {args.budget_ms:.0f} ms", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Local stand-ins for every upstream provider, with latency and error injection.
+
+The stub is a small ASGI app. It can be mounted in-process through
+httpx.ASGITransport, or served on a real port with uvicorn so that the
+connection pools are exercised too. Each provider lives under its own path
+prefix. ``base_urls`` gives the settings that point the services at it.
+"""
+
+import asyncio
+import random
+from dataclasses import dataclass, field
+from typing import Dict
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from benchmarks.payloads import (amadeus_flight_offers, exchangerate_latest, opentripmap_geoname,
+                                 openweather_current, timeapi_current)
+
+UPSTREAMS = ("amadeus", "openweather", "exchangerate", "timeapi", "opentripmap")
+
+
+@dataclass
+class StubConfig:
+    """Per-upstream latency (seconds) and error rate (0-1), plus relative jitter"""
+
+    latency: Dict[str, float] = field(default_factory=lambda: {
+        "amadeus": 0.25, "openweather": 0.05, "exchangerate": 0.05, "timeapi": 0.03, "opentripmap": 0.05
+    })
+    error_rate: Dict[str, float] = field(default_factory=dict)
+    jitter: float = 0.2
+    seed: int = 0
+    calls: Dict[str, int] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self._rng = random.Random(self.seed)
+
+    async def inject(self, upstream: str):
+        """Sleep for the upstream's latency, then return an error response if one is due"""
+
+        self.calls[upstream] = self.calls.get(upstream, 0) + 1
+
+        delay = self.latency.get(upstream, 0.0)
+        if delay > 0:
+            await asyncio.sleep(max(0.0, delay * (1 + self._rng.uniform(-self.jitter, self.jitter))))
+
+        if self._rng.random() < self.error_rate.get(upstream, 0.0):
+            return JSONResponse({"error": "injected failure"}, status_code=503)
+        return None
+
+
+def base_urls(root: str) -> Dict[str, str]:
+    """Settings that point every service at a stub served from root"""
+
+    return {
+        "AMADEUS_TOKEN_URL": f"{root}/amadeus/v1/security/oauth2/token",
+        "AMADEUS_FLIGHT_URL": f"{root}/amadeus/v2/shopping/flight-offers",
+        "OPENWEATHER_BASE_URL": f"{root}/openweather/data/2.5/weather",
+        "EXCHANGERATE_BASE_URL": f"{root}/exchangerate/v6",
+        "TIMEAPI_BASE_URL": f"{root}/timeapi/api/Time/current/zone",
+        "OPENTRIPMAP_BASE_URL": f"{root}/opentripmap/0.1/en/places/geoname"
+    }
+
+
+def create_stub_app(config: StubConfig) -> FastAPI:
+    stub = FastAPI(title="Upstream stubs", docs_url=None, redoc_url=None, openapi_url=None)
+
+    @stub.post("/amadeus/v1/security/oauth2/token")
+    async def amadeus_token():
+        return await config.inject("amadeus") or {
+            "type": "amadeusOAuth2Token", "access_token": f"stub-token-{config.calls['amadeus']}",
+            "token_type": "Bearer", "expires_in": 1799
+        }
+
+    @stub.get("/amadeus/v2/shopping/flight-offers")
+    async def amadeus_flight_offers_endpoint(request: Request):
+        params = request.query_params
+        return await config.inject("amadeus") or amadeus_flight_offers(
+            params.get("originLocationCode", ""),
+            params.get("destinationLocationCode", ""),
+            params.get("departureDate", "2026-01-01"),
+            params.get("returnDate"),
+            count=int(params.get("max", 10)),
+            currency=params.get("currencyCode", "USD")
+        )
+
+    @stub.get("/openweather/data/2.5/weather")
+    async def openweather(q: str = ""):
+        return await config.inject("openweather") or openweather_current(q)
+
+    @stub.get("/exchangerate/v6/{api_key}/latest/{base}")
+    async def exchangerate(api_key: str, base: str):
+        return await config.inject("exchangerate") or exchangerate_latest(base.upper())
+
+    @stub.get("/timeapi/api/Time/current/zone")
+    async def timeapi(timeZone: str = ""):
+        return await config.inject("timeapi") or timeapi_current(timeZone)
+
+    @stub.get("/opentripmap/0.1/en/places/geoname")
+    async def opentripmap(name: str = ""):
+        return await config.inject("opentripmap") or opentripmap_geoname(name)
+
+    return stub
@@ -1,58 +1,55 @@
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import flights, weather, itinerary, exchange, time, retell
+from app.routers import flights, weather, itinerary, exchange, time, retell, trip
 from app.config import settings
+from app.services.http_client import http_client_manager
+from app.services.amadeus import amadeus_service
+from app.services.flight import flight_service
+from app.services.exchange import exchange_rate_service
+from app.services.weather import weather_service
+from app.services.itinerary import itinerary_service
+from app.services.trip_brief import trip_brief_service
+from app.utils.coalesce import coalescing_stats
+from app.utils.deadline import shed_expired
+from app.utils.negative_cache import negative_cache
+from app.utils.fast_json import FastJSONResponse
+from app.utils.log_queue import configure_logging
+from app.utils.metrics import registry
+from app.middleware import DeadlineMiddleware, RequestLoggingMiddleware
+from contextlib import asynccontextmanager
 import uvicorn
 import socket
 import logging
-import json
-from starlette.middleware.base import BaseHTTPMiddleware
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging (handlers run on a background thread)
+configure_logging(settings.LOG_LEVEL)
 logger = logging.getLogger(__name__)
 
-# Custom middleware to log requests
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        # Log request details
-        logger.info(f"=== INCOMING REQUEST ===")
-        logger.info(f"Method: {request.method}")
-        logger.info(f"URL: {request.url}")
-        logger.info(f"Headers: {dict(request.headers)}")
-        
-        # Log request body for POST requests
-        if request.method == "POST":
-            body = await request.body()
-            if body:
-                try:
-                    body_json = json.loads(body.decode())
-                    logger.info(f"Request Body: {json.dumps(body_json, indent=2)}")
-                except:
-                    logger.info(f"Request Body (raw): {body.decode()}")
-            else:
-                logger.info("Request Body: Empty")
-        
-        # Process the request
-        response = await call_next(request)
-        
-        # Log response status
-        logger.info(f"Response Status: {response.status_code}")
-        logger.info(f"=== END REQUEST ===\n")
-        
-        return response
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open shared upstream connection pools
+    await http_client_manager.startup()
+    amadeus_service.start_token_refresher()
+    yield
+    await trip_brief_service.shutdown()
+    await amadeus_service.stop_token_refresher()
+    await http_client_manager.shutdown()
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Retell AI - Amadeus Flight API",
     description="Flight search integration for Retell AI voice agents",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
+    dependencies=[Depends(shed_expired)]
 )
 
-# Add request logging middleware (add this FIRST)
+# Start each request's deadline clock; added before logging so logging wraps it
+app.add_middleware(DeadlineMiddleware)
+
+# Add request logging middleware (wraps the deadline middleware)
 app.add_middleware(RequestLoggingMiddleware)
 
 # Add CORS middleware
@@ -71,6 +68,7 @@ app.include_router(itinerary.router)
 app.include_router(exchange.router)
 app.include_router(time.router)
 app.include_router(retell.router)
+app.include_router(trip.router)
 
 @app.get("/")
 async def root():
@@ -88,6 +86,25 @@ async def health():
         "timeapi_configured": True
     }
 
+@app.get("/health/pools")
+async def health_pools():
+    return http_client_manager.pool_stats()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/health/cache")
+async def health_cache():
+    return {
+        "flights": flight_service.cache_stats(),
+        "exchange_rate_tables": exchange_rate_service.cache_stats(),
+        "weather": weather_service.cache_stats(),
+        "geonames": itinerary_service.cache_stats(),
+        "negative": negative_cache.stats(),
+        "coalescing": coalescing_stats()
+    }
+
 def find_free_port():
     """Find a free port to use"""
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
@@ -0,0 +1,33 @@
+import os
+import sys
+from typing import Callable
+
+import httpx
+import pytest
+
+# Keep the app off real upstreams and out of the working tree's cache files
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("CACHE_BACKEND", "memory")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings  # noqa: E402
+from app.services.http_client import http_client_manager  # noqa: E402
+
+
+@pytest.fixture
+def mock_upstreams(monkeypatch):
+    """Route every upstream client through a handler(request) -> httpx.Response"""
+
+    def install(handler: Callable[[httpx.Request], httpx.Response]):
+        monkeypatch.setattr(http_client_manager, "_build_client",
+                            lambda upstream: httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        http_client_manager._clients.clear()
+
+    yield install
+    http_client_manager._clients.clear()
+
+
+@pytest.fixture
+def amadeus_keys(monkeypatch):
+    monkeypatch.setattr(settings, "AMADEUS_API_KEY", "key")
+    monkeypatch.setattr(settings, "AMADEUS_API_SECRET", "secret")
@@ -0,0 +1,27 @@
+import asyncio
+
+from app.models import FlightSearchRequest
+from app.services.airports import airport_index
+from app.services.flight import flight_service
+
+
+def test_only_exact_matches_resolve():
+    assert airport_index.resolve("Heathrow") == "LHR"
+    assert airport_index.resolve("Mexico City") == "MEX"
+    assert airport_index.resolve("London City") == "LCY"
+    assert airport_index.resolve("New York City") == "NYC"
+
+    # Near matches are left for the caller to confirm
+    assert airport_index.resolve("Kansas City") is None
+    assert airport_index.resolve("Atlantic City") is None
+    assert airport_index.resolve("heathrw") is None
+    assert [place["code"] for place in airport_index.search("heathrw")] == ["LHR"]
+
+
+def test_flight_search_asks_before_using_a_near_match():
+    result = asyncio.run(flight_service.search_flights(FlightSearchRequest(
+        origin="Heathrw", destination="JFK", departure_date="2026-12-01"
+    )))
+
+    assert "Did you mean" in result["error"]
+    assert [place["code"] for place in result["candidates"]] == ["LHR"]
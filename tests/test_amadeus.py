@@ -0,0 +1,52 @@
+import asyncio
+
+import httpx
+
+from app.config import settings
+from app.services.amadeus import AmadeusService
+
+
+def _token_and_flights(tokens, rejected_tokens, calls):
+    """Hand out tokens in order; flight calls with a rejected token get 401"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if "oauth2" in request.url.path:
+            calls.append("token")
+            return httpx.Response(200, json={"access_token": tokens.pop(0), "expires_in": 1799})
+
+        bearer = request.headers["Authorization"].split()[-1]
+        calls.append(bearer)
+        if bearer in rejected_tokens:
+            return httpx.Response(401, json={"errors": [{"code": 38190}]})
+        return httpx.Response(200, json={"data": [], "dictionaries": {}})
+
+    return handler
+
+
+def test_401_retry_fetches_a_new_token(mock_upstreams, amadeus_keys):
+    calls = []
+    mock_upstreams(_token_and_flights(["t1", "t2"], {"t1"}, calls))
+    service = AmadeusService()
+
+    result = asyncio.run(service.search_flights({"origin": "JFK", "destination": "LHR", "departure_date": "2026-12-01"}))
+
+    assert result == {"data": [], "dictionaries": {}}
+    assert calls == ["token", "t1", "token", "t2"]
+
+
+def test_waiting_worker_leaves_the_other_workers_lease(mock_upstreams, amadeus_keys, monkeypatch):
+    calls = []
+    mock_upstreams(_token_and_flights(["t1"], set(), calls))
+    monkeypatch.setattr(settings, "AMADEUS_TOKEN_LEASE_TIME", 0.3)
+    service = AmadeusService()
+
+    async def run():
+        # Another worker holds the lease and never publishes a token
+        assert await service._token_store.add("refresh_lease", -1, ttl=5)
+        token = await service.get_access_token()
+        return token, await service._token_store.get("refresh_lease")
+
+    token, lease = asyncio.run(run())
+
+    assert token == "t1"
+    assert lease == -1
@@ -0,0 +1,43 @@
+import asyncio
+import time
+
+import pytest
+
+from app.utils import deadline
+from app.utils.coalesce import RequestCoalescer
+from app.utils.deadline import Deadline, DeadlineExceeded
+
+
+async def _call_with_deadline(coalescer, budget, factory):
+    token = deadline.start(Deadline(budget) if budget is not None else None)
+    try:
+        return await coalescer.run("key", factory)
+    finally:
+        deadline.reset(token)
+
+
+def test_each_waiter_gives_up_at_its_own_deadline():
+    seen = []
+
+    async def factory():
+        seen.append(deadline.remaining())
+        await asyncio.sleep(0.2)
+        return "rates"
+
+    async def scenario():
+        coalescer = RequestCoalescer("test")
+        start = time.monotonic()
+        hurried = asyncio.ensure_future(_call_with_deadline(coalescer, 0.05, factory))
+        await asyncio.sleep(0)
+        patient = asyncio.ensure_future(_call_with_deadline(coalescer, 1.0, factory))
+
+        with pytest.raises(DeadlineExceeded):
+            await hurried
+        assert time.monotonic() - start < 0.15
+
+        assert await patient == "rates"
+        assert coalescer.upstream_calls == 1
+
+    asyncio.run(scenario())
+    # The shared call is not bound by the first caller's deadline
+    assert seen == [None]
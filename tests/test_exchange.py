@@ -0,0 +1,65 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.services.exchange import ExchangeRateService
+
+RATES = {"USD": 1, "VND": 25340.0, "KWD": 0.3069, "IDR": 16250.0, "BHD": 0.376}
+
+
+@pytest.fixture
+def exchange(mock_upstreams, monkeypatch):
+    monkeypatch.setattr(settings, "EXCHANGERATE_API_KEY", "key")
+
+    def install(handler):
+        mock_upstreams(handler)
+        return ExchangeRateService()
+
+    return install
+
+
+def _table(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"result": "success", "base_code": "USD", "conversion_rates": RATES})
+
+
+def test_small_cross_rates_keep_their_precision(exchange):
+    service = exchange(_table)
+
+    single = asyncio.run(service.convert_currency("VND", "KWD", 1_000_000))
+    bulk = asyncio.run(service.convert_bulk("IDR", ["BHD"], [1_000_000]))
+
+    assert single["conversion"]["conversion_rate"] == 1.21113e-05
+    assert single["conversion"]["converted_amount"] == round(1_000_000 * 0.3069 / 25340.0, 4)
+    assert bulk["rates"] == {"BHD": 2.31385e-05}
+    assert bulk["conversions"][0]["converted"] == {"BHD": round(1_000_000 * 0.376 / 16250.0, 4)}
+
+
+@pytest.mark.parametrize("status_code, error_type, expected, cached", [
+    (200, "invalid-key", 503, False),
+    (403, "inactive-account", 503, False),
+    (200, "quota-reached", 429, False),
+    (404, "unsupported-code", 404, True),
+    (400, "malformed-request", 400, True),
+])
+def test_only_input_errors_are_negatively_cached(exchange, status_code, error_type, expected, cached):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(status_code, json={"result": "error", "error-type": error_type})
+
+    service = exchange(handler)
+
+    async def twice():
+        outcomes = []
+        for _ in range(2):
+            try:
+                await service.get_rate_table(f"X{error_type[:2].upper()}")
+            except Exception as e:
+                outcomes.append(e.status_code)
+        return outcomes
+
+    assert asyncio.run(twice()) == [expected, expected]
+    assert len(calls) == (1 if cached else 2)
@@ -0,0 +1,80 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.services.resilience import CLOSED, HALF_OPEN, OPEN, CircuitOpenError, ResilienceLayer
+
+
+@pytest.fixture
+def layer(monkeypatch):
+    monkeypatch.setattr(settings, "CIRCUIT_FAILURE_THRESHOLD", 2)
+    monkeypatch.setattr(settings, "CIRCUIT_RESET_TIMEOUT", 0.05)
+    monkeypatch.setattr(settings, "UPSTREAM_MAX_RETRIES", 0)
+    return ResilienceLayer()
+
+
+async def _refused():
+    raise httpx.ConnectError("connection refused")
+
+
+async def _ok():
+    return httpx.Response(200)
+
+
+async def _hang():
+    await asyncio.sleep(10)
+
+
+def test_breaker_opens_probes_and_closes(layer):
+    async def scenario():
+        breaker = layer.breaker("test")
+        for _ in range(2):
+            with pytest.raises(httpx.ConnectError):
+                await layer.execute("test", "GET", _refused)
+        assert breaker.state == OPEN
+
+        # Fails fast without calling the upstream
+        with pytest.raises(CircuitOpenError):
+            await layer.execute("test", "GET", _ok)
+
+        # A failed probe opens it again
+        await asyncio.sleep(0.06)
+        with pytest.raises(httpx.ConnectError):
+            await layer.execute("test", "GET", _refused)
+        assert breaker.state == OPEN
+
+        await asyncio.sleep(0.06)
+        response = await layer.execute("test", "GET", _ok)
+        assert response.status_code == 200
+        assert breaker.state == CLOSED
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_probe_lets_the_next_call_through(layer):
+    async def scenario():
+        breaker = layer.breaker("test")
+        for _ in range(2):
+            with pytest.raises(httpx.ConnectError):
+                await layer.execute("test", "GET", _refused)
+
+        await asyncio.sleep(0.06)
+        probe = asyncio.ensure_future(layer.execute("test", "GET", _hang))
+        await asyncio.sleep(0.01)
+        assert breaker.state == HALF_OPEN
+
+        # A concurrent call is refused while the probe runs
+        with pytest.raises(CircuitOpenError):
+            await layer.execute("test", "GET", _ok)
+
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+        response = await layer.execute("test", "GET", _ok)
+        assert response.status_code == 200
+        assert breaker.state == CLOSED
+
+    asyncio.run(scenario())
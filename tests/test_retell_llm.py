@@ -0,0 +1,70 @@
+import asyncio
+import json
+import time
+from datetime import date, timedelta
+
+import httpx
+from fastapi.testclient import TestClient
+
+from app.services.retell_llm import FLIGHT_PATTERN, REMINDER, parse_spoken_date
+from main import app
+
+# A Saturday, so "next friday" is six days out
+TODAY = date(2026, 10, 17)
+
+
+def _route(text):
+    match = FLIGHT_PATTERN.search(text)
+    return match.group("origin"), match.group("destination")
+
+
+def test_destination_stops_before_the_date():
+    assert _route("flights from boston to london tomorrow") == ("boston", "london")
+    assert _route("from new york to paris next friday") == ("new york", "paris")
+    assert _route("from rome to san francisco 3rd of june") == ("rome", "san francisco")
+    assert _route("from sfo to tokyo 2026-12-01") == ("sfo", "tokyo")
+    assert _route("from boston to london on june 3rd") == ("boston", "london")
+
+    assert parse_spoken_date("from new york to paris next friday", TODAY) == "2026-10-23"
+    assert parse_spoken_date("flights from boston to london tomorrow", TODAY) == "2026-10-18"
+
+
+async def _slow_flights(request: httpx.Request) -> httpx.Response:
+    if "oauth2" in request.url.path:
+        return httpx.Response(200, json={"access_token": "t1", "expires_in": 1799})
+    # Still searching when the caller barges in
+    await asyncio.sleep(1)
+    return httpx.Response(200, json={"data": [], "dictionaries": {}})
+
+
+def _turn(response_id, text, interaction_type="response_required"):
+    return json.dumps({
+        "interaction_type": interaction_type,
+        "response_id": response_id,
+        "transcript": [{"role": "user", "content": text}]
+    })
+
+
+def test_barge_in_supersedes_the_running_response(mock_upstreams, amadeus_keys):
+    mock_upstreams(_slow_flights)
+    tomorrow = date.today() + timedelta(days=1)
+
+    with TestClient(app) as client, client.websocket_connect("/api/retell/llm-websocket/call-1") as ws:
+        assert ws.receive_json()["response_type"] == "config"
+        assert ws.receive_json()["content_complete"] is True
+
+        ws.send_text(_turn(1, "Flights from Boston to London tomorrow"))
+        ack = ws.receive_json()
+        assert ack["response_id"] == 1
+        assert ack["content"] == (f"Let me check flights from Boston to London on "
+                                  f"{tomorrow.strftime('%A, %B')} {tomorrow.day}.")
+
+        ws.send_text(_turn(2, "", interaction_type="reminder_required"))
+        assert ws.receive_json() == {"response_type": "response", "response_id": 2, "content": REMINDER,
+                                     "content_complete": False, "end_call": False}
+        assert ws.receive_json()["content_complete"] is True
+
+        # Give the superseded search time to finish; nothing from it may follow
+        time.sleep(1.5)
+        ws.send_text(json.dumps({"interaction_type": "ping_pong", "timestamp": 1}))
+        assert ws.receive_json() == {"response_type": "ping_pong", "timestamp": 1}
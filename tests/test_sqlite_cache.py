@@ -0,0 +1,28 @@
+import time
+
+from app.utils.sqlite_cache import SQLiteCache
+
+
+def test_writes_evict_expired_and_excess_rows(tmp_path):
+    store = SQLiteCache(str(tmp_path / "cache.sqlite3"), table="bounded", max_rows=10)
+
+    store.set("gone", 1, ttl=0.01)
+    time.sleep(0.02)
+    for i in range(25):
+        store.set(f"key{i}", i, ttl=60 + i)
+
+    assert store.count() == 10
+    assert store.get("gone") is None
+    # The entries that expire last are kept
+    assert store.get("key24") == 24
+    assert store.get("key0") is None
+
+
+def test_interval_purges_expired_rows_without_a_cap(tmp_path):
+    store = SQLiteCache(str(tmp_path / "cache.sqlite3"), table="unbounded", purge_interval=0)
+
+    store.set("gone", 1, ttl=0.01)
+    time.sleep(0.02)
+    store.set("kept", 2, ttl=60)
+
+    assert store.count() == 1
@@ -0,0 +1,39 @@
+import asyncio
+
+import httpx
+
+from app.config import settings
+from app.services.weather import WeatherService
+
+PLACES = {
+    "London, CA": {"id": 6058560, "name": "London", "sys": {"country": "CA"}},
+    "London": {"id": 2643743, "name": "London", "sys": {"country": "GB"}},
+}
+
+
+def test_ambiguous_name_is_not_aliased_to_the_last_match(mock_upstreams, monkeypatch):
+    monkeypatch.setattr(settings, "OPENWEATHER_API_KEY", "key")
+    queries = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        q = request.url.params["q"]
+        queries.append(q)
+        return httpx.Response(200, json={**PLACES[q], "coord": {"lat": 0, "lon": 0},
+                                         "weather": [{"main": "Rain", "description": "rain"}], "main": {"temp": 10}})
+
+    mock_upstreams(handler)
+    service = WeatherService()
+
+    async def scenario():
+        ontario = await service.get_current_weather("London, CA")
+        england = await service.get_current_weather("London")
+        # The canonical spelling of each place is remembered
+        again = await service.get_current_weather("london,ca")
+        return ontario, england, again
+
+    ontario, england, again = asyncio.run(scenario())
+
+    assert ontario["location"]["country"] == "CA"
+    assert england["location"]["country"] == "GB"
+    assert again["location"]["country"] == "CA"
+    assert queries == ["London, CA", "London"]